@@ -5,33 +5,71 @@
 import sys
 from pathlib import Path
 import datetime
+import time
 import traceback
-import yaml
 import uuid
 from textwrap import dedent
 import os
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
-from src.utils.bedrock_agent import Agent, SupervisorAgent, Task, region, account_id
+from src.utils.yaml_cache import load_yaml
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 task_yaml_path = os.path.join(current_dir, "tasks.yaml")
 agent_yaml_path = os.path.join(current_dir, "agents.yaml")
 
+AGENT_NAMES = ("startup_advisor", "lead_market_analyst", "chief_strategist",
+               "creative_director", "content_writer", "formatted_report_writer")
+
+# static part of the supervisor's additional instructions; the table name is appended per run
+WORKING_MEMORY_INSTRUCTIONS = dedent("""
+    Use a single Working Memory table for this entire set of tasks, with
+    the table name given below. Tell your collaborators this table name as part of
+    every request, so that they are not confused and they share state effectively.
+    The keys they use in that table will allow them to keep track of any number
+    of state items they require. When you have completed all tasks, summarize
+    your work, and share the table name so that all the results can be used and
+    analyzed.""")
+
+def _str_to_bool(value):
+    """argparse type for the "true"/"false" flags, so args arrive as real booleans."""
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    raise argparse.ArgumentTypeError(f"expected 'true' or 'false', got '{value}'")
+
+def _write_chunk(text):
+    """Echo streamed answer text as soon as it arrives."""
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
 def main(args):
+    # imported here so --help and argument errors do not pay for boto3 and the
+    # AWS calls bedrock_agent makes at import time
+    from src.utils.bedrock_agent import Agent, SupervisorAgent, Task, region, account_id
 
-    if args.recreate_agents == "false":
+    if not args.recreate_agents:
         Agent.set_force_recreate_default(False)
     else:
         Agent.set_force_recreate_default(True)
         Agent.delete_by_name("startup_advisor", verbose=True)
-    if args.clean_up == "true":
-        Agent.delete_by_name("startup_advisor", verbose=True)
-        Agent.delete_by_name("lead_market_analyst", verbose=True)
-        Agent.delete_by_name("chief_strategist", verbose=True)
-        Agent.delete_by_name("creative_director", verbose=True)
-        Agent.delete_by_name("content_writer", verbose=True)
-        Agent.delete_by_name("formatted_report_writer", verbose=True)
+    if args.clean_up:
+        # the supervisor still references its collaborators, so it goes first;
+        # after that the collaborator deletes are independent and run side by
+        # side. One failure should not keep the others from being cleaned up.
+        supervisor, *collaborators = AGENT_NAMES
+        try:
+            Agent.delete_by_name(supervisor, verbose=True)
+        except Exception as e:
+            print(f"Error deleting {supervisor}: {e}")
+        with ThreadPoolExecutor(max_workers=len(collaborators)) as executor:
+            futures = {executor.submit(Agent.delete_by_name, name, verbose=True): name
+                       for name in collaborators}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Error deleting {futures[future]}: {e}")
         
     else:
         inputs = {
@@ -40,8 +78,7 @@ def main(args):
             'feedback_iteration_count': args.iterations,
         }    
 
-        with open(task_yaml_path, 'r') as file:
-            task_yaml_content = yaml.safe_load(file)
+        task_yaml_content = load_yaml(task_yaml_path)
 
         research_task = Task('research_task', task_yaml_content, inputs)
         marketing_strategy_task = Task('marketing_strategy_task', task_yaml_content, inputs)
@@ -126,19 +163,23 @@ def main(args):
             },
         }
 
-        with open(agent_yaml_path, 'r') as file:
-            agent_yaml_content = yaml.safe_load(file)
-
-        lead_market_analyst = Agent('lead_market_analyst', agent_yaml_content,
-                                    tools=[web_search_tool, set_value_for_key, get_key_value])
-        chief_strategist = Agent('chief_strategist', agent_yaml_content,
-                                    tools=[web_search_tool, set_value_for_key, get_key_value])
-        creative_director = Agent('creative_director', agent_yaml_content,
-                                  tools=[web_search_tool, set_value_for_key, get_key_value])
-        content_creator = Agent('content_writer', agent_yaml_content,
-                                  tools=[web_search_tool, set_value_for_key, get_key_value])
-        formatted_report_writer = Agent('formatted_report_writer', agent_yaml_content,
-                                  tools=[web_search_tool, set_value_for_key, get_key_value])
+        agent_yaml_content = load_yaml(agent_yaml_path)
+
+        def create_collaborator(name):
+            print(f"Creating {name}...")
+            return Agent(name, agent_yaml_content,
+                         tools=[web_search_tool, set_value_for_key, get_key_value])
+
+        # each collaborator is created and prepared independently, so build them concurrently
+        collaborator_names = AGENT_NAMES[1:]
+        with ThreadPoolExecutor(max_workers=len(collaborator_names)) as executor:
+            collaborators = dict(zip(collaborator_names,
+                                     executor.map(create_collaborator, collaborator_names)))
+        lead_market_analyst = collaborators['lead_market_analyst']
+        chief_strategist = collaborators['chief_strategist']
+        creative_director = collaborators['creative_director']
+        content_creator = collaborators['content_writer']
+        formatted_report_writer = collaborators['formatted_report_writer']
         
         print("\n\nCreating marketing_strategy_agent as a supervisor agent...\n\n")
         startup_advisor = SupervisorAgent("startup_advisor", agent_yaml_content,
@@ -147,38 +188,47 @@ def main(args):
                                     formatted_report_writer], 
                                     verbose=False)
         
-        if args.recreate_agents == "false":
+        if not args.recreate_agents:
             print("\n\nInvoking supervisor agent...\n\n")
 
-            time_before_call = datetime.datetime.now()
-            print(f"time before call: {time_before_call}\n")
+            print(f"time before call: {datetime.datetime.now()}\n")
+            time_before_call = time.perf_counter()
+            streamed_chunks = []
+
+            def on_chunk(text):
+                streamed_chunks.append(text)
+                _write_chunk(text)
+
             try:
-                folder_name = "startup-advisor-" + str(uuid.uuid4())
+                folder_name = "startup-advisor-" + uuid.uuid4().hex
                 result = startup_advisor.invoke_with_tasks([
                                 research_task, marketing_strategy_task, 
                                 campaign_idea_task, copy_creation_task, 
                                 detailed_campaign_task, iterative_revisions_task,
                                 final_report_output_task
                             ],
-                            additional_instructions=dedent(f"""
-                                Use a single Working Memory table for this entire set of tasks, with 
-                                table name: {folder_name}. Tell your collaborators this table name as part of 
-                                every request, so that they are not confused and they share state effectively.
-                                The keys they use in that table will allow them to keep track of any number 
-                                of state items they require. When you have completed all tasks, summarize 
-                                your work, and share the table name so that all the results can be used and 
-                                analyzed."""),
-                            processing_type="sequential", 
+                            # keep the static guidance ahead of the per-run table name so the
+                            # prompt prefix stays identical from run to run.
+                            additional_instructions=WORKING_MEMORY_INSTRUCTIONS
+                                + f"\nWorking Memory table name: {folder_name}",
+                            processing_type=args.processing_type,
                             enable_trace=True, trace_level=args.trace_level,
-                            verbose=True)
-                print(result)
+                            verbose=True,
+                            on_chunk=on_chunk,
+                            performance_latency=args.latency)
+                print()
+                # the streamed text has no references; when the agent cited sources,
+                # show the fully cited answer once the stream is done
+                if result != "".join(streamed_chunks):
+                    print("\nAnswer with references:\n")
+                    print(result)
             except Exception as e:
                 print(e)
                 traceback.print_exc()
                 pass
 
-            duration = datetime.datetime.now() - time_before_call
-            print(f"\nTime taken: {duration.total_seconds():,.1f} seconds")
+            duration = time.perf_counter() - time_before_call
+            print(f"\nTime taken: {duration:,.1f} seconds")
         else:
             print("Recreated agents.")
         
@@ -200,7 +250,7 @@ potential. Be sure to include a draft for a video ad.
 
     parser = argparse.ArgumentParser()
 
-    parser.add_argument("--recreate_agents", required=False, default='true', help="False if reusing existing agents.")
+    parser.add_argument("--recreate_agents", required=False, default=True, type=_str_to_bool, help="False if reusing existing agents.")
     parser.add_argument("--web_domain", required=False, 
                         default=default_inputs['customer_domain'],
                         help="The web domain name for the project (e.g., AnyCompany.ai).")
@@ -211,10 +261,16 @@ potential. Be sure to include a draft for a video ad.
                         default=default_inputs['project_description'],
                         help="The project that needs a marketing strategy.")
     parser.add_argument("--trace_level", required=False, default="core", help="The level of trace, 'core', 'outline', 'all'.")
+    parser.add_argument("--processing_type", required=False, default="allow_parallel",
+                        choices=["sequential", "allow_parallel"],
+                        help="Whether the supervisor may run independent tasks in parallel.")
+    parser.add_argument("--latency", required=False, default=None, choices=["standard", "optimized"],
+                        help="Model latency profile for the supervisor; 'optimized' needs a supported model.")
     parser.add_argument(
         "--clean_up",
         required=False,
-        default="false",
+        default=False,
+        type=_str_to_bool,
         help="Cleanup all infrastructure.",
     )
     args = parser.parse_args()
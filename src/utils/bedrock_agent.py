@@ -29,22 +29,23 @@ import uuid
 from textwrap import dedent
 from typing import List, Dict, Optional
 import time
+import functools
 from dataclasses import dataclass
 from typing import Self, Callable, Union
 from enum import Enum
-import yaml
 from src.utils.bedrock_agent_helper import AgentsForAmazonBedrock
+from src.utils.yaml_cache import load_yaml
 import json
 
 print(f"boto3 version: {boto3.__version__}")
 
-# Clients
-s3_client = boto3.client("s3")
-sts_client = boto3.client("sts")
-bedrock_agent_client = boto3.client("bedrock-agent")
-bedrock_agent_runtime_client = boto3.client("bedrock-agent-runtime")
-bedrock_client = boto3.client("bedrock")
+# Clients; the agent clients are the helper's, so every Agent shares one set of connection pools
 agents_helper = AgentsForAmazonBedrock()
+s3_client = agents_helper._s3_client
+sts_client = agents_helper._sts_client
+bedrock_agent_client = agents_helper._bedrock_agent_client
+bedrock_agent_runtime_client = agents_helper._bedrock_agent_runtime_client
+bedrock_client = boto3.client("bedrock")
 
 region = agents_helper.get_region()
 account_id = sts_client.get_caller_identity()["Account"]
@@ -70,6 +71,20 @@ DEFAULT_SUPERVISOR_MODEL = "us.anthropic.claude-3-5-sonnet-20241022-v2:0"
 
 MAX_DESCR_SIZE = 200  # Due to max size enforced by Agents for description
 
+# Opening of the supervisor prompt for each processing_type, followed by the numbered tasks
+_TASK_PREAMBLES = {
+    "sequential": """
+Please perform the following tasks sequentially. Be sure you do not 
+perform any of them in parallel. If a task will require information produced from a prior task, 
+be sure to include the details as input to the task.\n\n""",
+    "allow_parallel": """
+Please perform as many of the following tasks in parallel where possible.
+When a dependency between tasks is clear, execute those tasks in sequential order. 
+If a task will require information produced from a prior task,
+be sure to include the details as input to the task.\n\n""",
+}
+_TASK_REVIEW_REMINDER = "\nBefore returning the final answer, review whether you have achieved the expected output for each task."
+
 
 class ParamType(str, Enum):
     STRING = "string"
@@ -241,14 +256,30 @@ class Task:
         self.expected_output = yaml_content[name]["expected_output"]
 
         # update the description and expected output to replace input vales for named inputs
-        self.description = self.description.format(**inputs)
-        self.expected_output = self.expected_output.format(**inputs)
+        self.description = self._render(self.description, inputs)
+        self.expected_output = self._render(self.expected_output, inputs)
 
         if "output_type" in yaml_content[name]:
             self.output_type = yaml_content[name]["output_type"]
         else:
             self.output_type = None
 
+        # names of the tasks whose output this task needs; the rest can run alongside it
+        self.depends_on = list(yaml_content[name].get("depends_on", []))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _format_cached(template: str, inputs_items: tuple) -> str:
+        return template.format(**dict(inputs_items))
+
+    @classmethod
+    def _render(cls, template: str, inputs: Dict) -> str:
+        # tasks built from the same yaml and inputs share the rendered text
+        try:
+            return cls._format_cached(template, tuple(sorted(inputs.items())))
+        except TypeError:  # unhashable input values
+            return template.format(**inputs)
+
     @classmethod
     def create(
         cls, name: str, description: str, expected_output: str, inputs: Dict = {}
@@ -468,8 +499,7 @@ class Agent:
 
     def needs_preparation(self) -> bool:
         """Return True if the agent needs to be prepared"""
-        bedrock_agent = boto3.client("bedrock-agent")
-        response = bedrock_agent.get_agent(agentId=self.agent_id)
+        response = bedrock_agent_client.get_agent(agentId=self.agent_id)
         agent_info = response["agent"]
 
         # Check if never prepared
@@ -757,20 +787,19 @@ class Agent:
         verbose: bool = False,
     ):
         """Create an agent from a YAML file (default 'agents.yaml')"""
-        with open(yaml_file, "r") as f:
-            yaml_content = yaml.safe_load(f)
-            return Agent(
-                name,
-                yaml_content=yaml_content,
-                guardrail=guardrail,
-                tool_code=tool_code,
-                tool_defs=tool_defs,
-                tools=tools,
-                kb_id=kb_id,
-                kb_descr=kb_descr,
-                llm=llm,
-                verbose=verbose,
-            )
+        yaml_content = load_yaml(yaml_file)
+        return Agent(
+            name,
+            yaml_content=yaml_content,
+            guardrail=guardrail,
+            tool_code=tool_code,
+            tool_defs=tool_defs,
+            tools=tools,
+            kb_id=kb_id,
+            kb_descr=kb_descr,
+            llm=llm,
+            verbose=verbose,
+        )
 
     def delete(self, verbose: bool = False):
         """Delete the agent"""
@@ -1087,6 +1116,8 @@ class SupervisorAgent:
         trace_level: str = "core",
         session_state: dict = {},
         multi_agent_names: dict = {},
+        on_chunk: Callable[[str], None] = None,
+        performance_latency: str = None,
     ):
         if multi_agent_names == {}:
             multi_agent_names = self.multi_agent_names
@@ -1099,6 +1130,9 @@ class SupervisorAgent:
             session_state=session_state,
             trace_level=trace_level,
             multi_agent_names=multi_agent_names,
+            stream_final_response=on_chunk is not None,
+            on_chunk=on_chunk,
+            performance_latency=performance_latency,
         )
 
     def invoke_with_tasks(
@@ -1109,35 +1143,19 @@ class SupervisorAgent:
         enable_trace: bool = False,
         trace_level: str = "none",
         verbose: bool = False,
+        on_chunk: Callable[[str], None] = None,
+        performance_latency: str = None,
     ):
-        prompt = ""
-        if processing_type == "sequential":
-            prompt += """
-Please perform the following tasks sequentially. Be sure you do not 
-perform any of them in parallel. If a task will require information produced from a prior task, 
-be sure to include the details as input to the task.\n\n"""
-            task_num = 1
-            for t in tasks:
-                prompt += f"Task {task_num}. {t}\n"
-                task_num += 1
-
-            prompt += "\nBefore returning the final answer, review whether you have achieved the expected output for each task."
-
-            if additional_instructions != "":
-                prompt += f"\n{additional_instructions}"
-        elif processing_type == "allow_parallel":
-            prompt += """
-Please perform as many of the following tasks in parallel where possible.
-When a dependency between tasks is clear, execute those tasks in sequential order. 
-If a task will require information produced from a prior task,
-be sure to include the details as input to the task.\n\n"""
-            task_num = 1
-            for t in tasks:
-                prompt += f"Task {task_num}. {t}\n"
-                task_num += 1
-
-            prompt += "\nBefore returning the final answer, review whether you have achieved the expected output for each task."
+        """Invoke the supervisor with a prompt built from the given tasks.
 
+        If on_chunk is provided, the final response is streamed and on_chunk is
+        called with each piece of text as it arrives; the full answer is still returned.
+        performance_latency ("standard" or "optimized") selects the model latency profile.
+        """
+        prompt = ""
+        preamble = _TASK_PREAMBLES.get(processing_type)
+        if preamble is not None:
+            prompt = preamble + self._format_task_list(tasks) + _TASK_REVIEW_REMINDER
             if additional_instructions != "":
                 prompt += f"\n{additional_instructions}"
 
@@ -1147,7 +1165,7 @@ be sure to include the details as input to the task.\n\n"""
         # make a session id with a prefix of current time to make the
         # id's sortable when looking at session logs or metrics or storage outputs.
         timestamp = int(time.time())
-        session_id = self.name + "-" + str(timestamp) + "-" + str(uuid.uuid1())
+        session_id = self.name + "-" + str(timestamp) + "-" + uuid.uuid1().hex
         if verbose:
             print(f"Session id: {session_id}")
 
@@ -1158,9 +1176,24 @@ be sure to include the details as input to the task.\n\n"""
             enable_trace=enable_trace,
             trace_level=trace_level,
             multi_agent_names=self.multi_agent_names,
+            on_chunk=on_chunk,
+            performance_latency=performance_latency,
         )
         return result
 
+    @staticmethod
+    def _format_task_list(tasks: list[Task]) -> str:
+        """Number the tasks, noting which earlier tasks each one depends on."""
+        task_numbers = {t.name: num for num, t in enumerate(tasks, start=1)}
+        lines = []
+        for num, t in enumerate(tasks, start=1):
+            line = f"Task {num}. {t}"
+            deps = [f"Task {task_numbers[d]}" for d in t.depends_on if d in task_numbers]
+            if deps:
+                line += f" (Depends on: {', '.join(deps)}.)"
+            lines.append(line + "\n")
+        return "".join(lines)
+
 
 import inspect
 from pydantic import create_model
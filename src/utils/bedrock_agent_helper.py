@@ -8,6 +8,7 @@ It includes methods for creating, updating, and invoking Agents, as well as mana
 IAM roles and Lambda functions for action groups.
 """
 import copy
+import functools
 
 import boto3
 import json
@@ -16,9 +17,10 @@ import uuid
 import zipfile
 from dateutil.tz import tzutc
 import os
+import sys
 import datetime
 from io import BytesIO
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import re
 from boto3.session import Session
 from botocore.config import Config
@@ -131,21 +133,41 @@ class AgentsForAmazonBedrock:
         """Constructs an instance."""
         self._boto_session = Session()
         self._region = self._boto_session.region_name
-        self._account_id = boto3.client("sts").get_caller_identity()["Account"]
-
-        self._bedrock_agent_client = boto3.client("bedrock-agent")
-
-        long_invoke_time_config = Config(read_timeout=600)
+        # control-plane calls: kept-alive connections, enough pool for agents being
+        # created side by side, and adaptive retries for throttled calls
+        client_config = Config(
+            tcp_keepalive=True,
+            max_pool_connections=32,
+            retries={"max_attempts": 5, "mode": "adaptive"},
+        )
+        self._sts_client = boto3.client("sts", config=client_config)
+        self._account_id = self._sts_client.get_caller_identity()["Account"]
+
+        self._bedrock_agent_client = boto3.client("bedrock-agent", config=client_config)
+
+        # long-running invocations, kept-alive connections, and room for concurrent
+        # invocations from several agents sharing this client
+        long_invoke_time_config = Config(
+            read_timeout=600,
+            tcp_keepalive=True,
+            max_pool_connections=32,
+            retries={"max_attempts": 5, "mode": "adaptive"},
+        )
         self._bedrock_agent_runtime_client = boto3.client(
             "bedrock-agent-runtime", config=long_invoke_time_config
         )
 
-        self._sts_client = boto3.client("sts")
-        self._iam_client = boto3.client("iam")
-        self._lambda_client = boto3.client("lambda")
-        self._s3_client = boto3.client("s3", region_name=self._region)
-        self._dynamodb_client = boto3.client("dynamodb", region_name=self._region)
-        self._dynamodb_resource = boto3.resource("dynamodb", region_name=self._region)
+        self._iam_client = boto3.client("iam", config=client_config)
+        self._lambda_client = boto3.client("lambda", config=client_config)
+        self._s3_client = boto3.client(
+            "s3", region_name=self._region, config=client_config
+        )
+        self._dynamodb_client = boto3.client(
+            "dynamodb", region_name=self._region, config=client_config
+        )
+        self._dynamodb_resource = boto3.resource(
+            "dynamodb", region_name=self._region, config=client_config
+        )
 
         self._suffix = f"{self._region}-{self._account_id}"
 
@@ -340,6 +362,18 @@ class AgentsForAmazonBedrock:
         _alias_arn = _agent_alias["agentAlias"]["agentAliasArn"]
         return _alias_arn
 
+    def _find_agent_summary(self, agent_name: str) -> Optional[dict]:
+        """Returns the list_agents summary for the named agent, or None if not found.
+
+        Pages through all agents, stopping at the page that contains the match.
+        """
+        _paginator = self._bedrock_agent_client.get_paginator("list_agents")
+        for _page in _paginator.paginate(PaginationConfig={"PageSize": 100}):
+            for _agent in _page["agentSummaries"]:
+                if _agent["agentName"] == agent_name:
+                    return _agent
+        return None
+
     def get_agent_id_by_name(self, agent_name: str) -> str:
         """Gets the Agent ID for the specified Agent.
 
@@ -349,11 +383,7 @@ class AgentsForAmazonBedrock:
         Returns:
             str: Agent ID, or None if not found
         """
-        _get_agents_resp = self._bedrock_agent_client.list_agents(maxResults=100)
-        _agents_json = _get_agents_resp["agentSummaries"]
-        _target_agent = next(
-            (agent for agent in _agents_json if agent["agentName"] == agent_name), None
-        )
+        _target_agent = self._find_agent_summary(agent_name)
         if _target_agent is None:
             return None
         else:
@@ -553,11 +583,7 @@ class AgentsForAmazonBedrock:
         Returns:
             str: ARN of the IAM role, or None if not found
         """
-        _get_agents_resp = self._bedrock_agent_client.list_agents(maxResults=100)
-        _agents_json = _get_agents_resp["agentSummaries"]
-        _target_agent = next(
-            (agent for agent in _agents_json if agent["agentName"] == agent_name), None
-        )
+        _target_agent = self._find_agent_summary(agent_name)
         if _target_agent is not None:
             # pprint.pp(_target_agent)
             _agent_id = _target_agent["agentId"]
@@ -579,11 +605,7 @@ class AgentsForAmazonBedrock:
         """
 
         # first find the agent ID from the agent Name
-        _get_agents_resp = self._bedrock_agent_client.list_agents(maxResults=100)
-        _agents_json = _get_agents_resp["agentSummaries"]
-        _target_agent = next(
-            (agent for agent in _agents_json if agent["agentName"] == agent_name), None
-        )
+        _target_agent = self._find_agent_summary(agent_name)
 
         if _target_agent is None:
             print(f"Agent {agent_name} not found")
@@ -1479,7 +1501,8 @@ class AgentsForAmazonBedrock:
         _citations = []
         _citations_event = None
 
-        _agent_answer = ""
+        _answer_chunks = []
+        _return_control = None
         _event_stream = _agent_resp["completion"]
 
         try:
@@ -1497,7 +1520,7 @@ class AgentsForAmazonBedrock:
                         )
 
                     # continue to build up the full answer
-                    _agent_answer += _tmp_agent_answer
+                    _answer_chunks.append(_tmp_agent_answer)
 
                     # stream the chunks
 
@@ -1526,7 +1549,7 @@ class AgentsForAmazonBedrock:
                                 print(colored(f"Citations: {_citations}", "blue"))
 
                 elif "returnControl" in _event:
-                    _agent_answer = _event["returnControl"]
+                    _return_control = _event["returnControl"]
 
                 if "trace" in _event and enable_trace:
                     if trace_level == "all":
@@ -1977,6 +2000,13 @@ class AgentsForAmazonBedrock:
                         #     # plt.imshow(img)
                         #     # plt.show()
 
+            # joined once instead of growing a string chunk by chunk
+            _agent_answer = (
+                _return_control
+                if _return_control is not None
+                else "".join(_answer_chunks)
+            )
+
             if enable_trace:
                 duration = datetime.datetime.now() - _time_before_call
 
@@ -2024,6 +2054,8 @@ class AgentsForAmazonBedrock:
         trace_level: str = "core",
         multi_agent_names: dict = {},
         stream_final_response: bool = False,
+        on_chunk: Callable[[str], None] = None,
+        performance_latency: str = None,
     ):
         """Invokes an agent with a given input text, while optional parameters
         also let you leverage an agent session, or target a specific agent alias.
@@ -2037,13 +2069,31 @@ class AgentsForAmazonBedrock:
             enable_trace (bool, optional): Whether to enable trace. Defaults to False.
             end_session (bool, optional): Whether to end the session. Defaults to False.
             trace_level (str, optional): The level of trace. Defaults to "none". Possible values are "none", "all", "core".
+            stream_final_response (bool, optional): Whether to stream the final response in chunks. Defaults to False.
+            on_chunk (Callable[[str], None], optional): Called with each answer chunk as it arrives. Defaults to None.
+            performance_latency (str, optional): Model latency setting, "standard" or "optimized". Defaults to None (service default).
 
         Returns:
             str: The answer from the agent.
         """
 
+        # while on_chunk is streaming the answer to stdout, trace output goes to
+        # stderr so the two do not interleave
+        _trace_print = (
+            functools.partial(print, file=sys.stderr)
+            if on_chunk is not None
+            else print
+        )
+
         _time_before_call = datetime.datetime.now()
 
+        _extra_args = {}
+        if performance_latency is not None:
+            # only sent when requested, since older boto3 releases reject the parameter
+            _extra_args["bedrockModelConfigurations"] = {
+                "performanceConfig": {"latency": performance_latency}
+            }
+
         _agent_resp = self._bedrock_agent_runtime_client.invoke_agent(
             inputText=input_text,
             agentId=agent_id,
@@ -2053,23 +2103,24 @@ class AgentsForAmazonBedrock:
             enableTrace=enable_trace,
             endSession=end_session,
             streamingConfigurations={"streamFinalResponse": stream_final_response},
+            **_extra_args,
         )
 
         if enable_trace:
             if trace_level == "all":
-                print(f"invokeAgent API response object: {_agent_resp}")
+                _trace_print(f"invokeAgent API response object: {_agent_resp}")
             else:
-                print(
+                _trace_print(
                     f"invokeAgent API request ID: {_agent_resp['ResponseMetadata']['RequestId']}"
                 )
-                print(f"invokeAgent API session ID: {session_id}")
-                print(f"  agent id: {agent_id}, agent alias id: {agent_alias_id}")
+                _trace_print(f"invokeAgent API session ID: {session_id}")
+                _trace_print(f"  agent id: {agent_id}, agent alias id: {agent_alias_id}")
 
         # Return error message if invoke was unsuccessful
         if _agent_resp["ResponseMetadata"]["HTTPStatusCode"] != 200:
             _error_message = f"API Response was not 200: {_agent_resp}"
             if enable_trace and trace_level == "all":
-                print(_error_message)
+                _trace_print(_error_message)
             return _error_message
 
         _total_in_tokens = 0
@@ -2082,7 +2133,7 @@ class AgentsForAmazonBedrock:
         _citations = []
         _citations_event = None
 
-        _agent_answer = ""
+        _answer_chunks = []
         _event_stream = _agent_resp["completion"]
 
         try:
@@ -2094,19 +2145,21 @@ class AgentsForAmazonBedrock:
                     _data = _event["chunk"]["bytes"]
                     _tmp_agent_answer = _data.decode("utf8")
                     if enable_trace and trace_level == "all":
-                        print(
+                        _trace_print(
                             f"tmp answer: '{_tmp_agent_answer}', streaming: {stream_final_response}, trace: {enable_trace}"
                         )
 
                     # continue to build up the full answer
-                    _agent_answer += _tmp_agent_answer
+                    _answer_chunks.append(_tmp_agent_answer)
+                    if on_chunk is not None:
+                        on_chunk(_tmp_agent_answer)
 
                     if _num_response_chunks == 0:
                         _time_to_first_token = (
                             datetime.datetime.now() - _overall_start_time
                         )
                         if enable_trace and stream_final_response:
-                            print(
+                            _trace_print(
                                 colored(
                                     f"Time to first token: {_time_to_first_token.total_seconds():,.1f}s\n",
                                     "yellow",
@@ -2119,7 +2172,7 @@ class AgentsForAmazonBedrock:
                         and stream_final_response
                         and _num_response_chunks < 3
                     ):
-                        print(
+                        _trace_print(
                             colored(
                                 f"Answer chunk [{_num_response_chunks}]: {_tmp_agent_answer}",
                                 "blue",
@@ -2129,7 +2182,7 @@ class AgentsForAmazonBedrock:
                     # print all keys in _event["chunk"] dictionary if more than just 'bytes' provided
                     if enable_trace and trace_level == "all":
                         if len(_event["chunk"].keys()) > 1:
-                            print(
+                            _trace_print(
                                 f"chunk keys beyond just 'bytes': {list(_event['chunk'].keys())}"
                             )
 
@@ -2139,11 +2192,11 @@ class AgentsForAmazonBedrock:
                             _citations_event = copy.deepcopy(_event)
                             _citations = _event["chunk"]["attribution"]["citations"]
                             if enable_trace and trace_level == "all":
-                                print(colored(f"Citations: {_citations}", "blue"))
+                                _trace_print(colored(f"Citations: {_citations}", "blue"))
 
                 if "trace" in _event and enable_trace:
                     if trace_level == "all":
-                        print("---")
+                        _trace_print("---")
                     else:
                         if "callerChain" in _event["trace"]:
                             if len(_event["trace"]["callerChain"]) > 1:
@@ -2167,9 +2220,9 @@ class AgentsForAmazonBedrock:
 
                         if "modelInvocationInput" in _route:
                             _orch_step += 1
-                            print(colored(f"---- Step {_orch_step} ----", "green"))
+                            _trace_print(colored(f"---- Step {_orch_step} ----", "green"))
                             _time_before_routing = datetime.datetime.now()
-                            print(
+                            _trace_print(
                                 colored(
                                     "Classifying request to immediately route to one collaborator if possible.",
                                     "blue",
@@ -2210,14 +2263,14 @@ class AgentsForAmazonBedrock:
 
 
                             if _classification == UNDECIDABLE_CLASSIFICATION:
-                                print(
+                                _trace_print(
                                     colored(
                                         f"Routing classifier did not find a matching collaborator. Reverting to 'SUPERVISOR' mode.",
                                         "magenta",
                                     )
                                 )
                             elif _classification == "keep_previous_agent":
-                                print(
+                                _trace_print(
                                     colored(
                                         f"Continuing conversation with previous collaborator.",
                                         "magenta",
@@ -2228,7 +2281,7 @@ class AgentsForAmazonBedrock:
                                 # _orch_step += 1
                             else:
                                 _sub_agent_name = _classification
-                                print(
+                                _trace_print(
                                     colored(
                                         f"Routing classifier chose collaborator: '{_classification}'",
                                         "magenta",
@@ -2237,7 +2290,7 @@ class AgentsForAmazonBedrock:
                                 # # since we replaced the typical orchestration step with a simple routing
                                 # # classification, bump the step count.
                                 # _orch_step += 1
-                            print(
+                            _trace_print(
                                 colored(
                                     f"Routing classifier took {_route_duration.total_seconds():,.1f}s, using {_in_tokens+_out_tokens} tokens (in: {_in_tokens}, out: {_out_tokens}).\n",
                                     "yellow",
@@ -2245,7 +2298,7 @@ class AgentsForAmazonBedrock:
                             )
 
                     if "failureTrace" in _event["trace"]["trace"]:
-                        print(
+                        _trace_print(
                             colored(
                                 f"Agent error: {_event['trace']['trace']['failureTrace']['failureReason']}",
                                 "red",
@@ -2258,7 +2311,7 @@ class AgentsForAmazonBedrock:
                         if trace_level in ["core", "outline"]:
                             if "rationale" in _orch:
                                 _rationale = _orch["rationale"]
-                                print(colored(f"{_rationale['text']}", "blue"))
+                                _trace_print(colored(f"{_rationale['text']}", "blue"))
 
                             if "invocationInput" in _orch:
                                 # NOTE: when agent determines invocations should happen in parallel
@@ -2267,7 +2320,7 @@ class AgentsForAmazonBedrock:
 
                                 if "actionGroupInvocationInput" in _input:
                                     if trace_level == "outline":
-                                        print(
+                                        _trace_print(
                                             colored(
                                                 f"Using tool: {_input['actionGroupInvocationInput']['function']}",
                                                 "magenta",
@@ -2278,14 +2331,14 @@ class AgentsForAmazonBedrock:
                                             "function"
                                             not in _input["actionGroupInvocationInput"]
                                         ):
-                                            print(
+                                            _trace_print(
                                                 colored(
                                                     f"EXPECTING to capture 'Using tool', but 'function' not found\n{_input['actionGroupInvocationInput']}",
                                                     "red",
                                                 )
                                             )
                                         else:
-                                            print(
+                                            _trace_print(
                                                 colored(
                                                     f"Using tool: {_input['actionGroupInvocationInput']['function']} with these inputs:",
                                                     "magenta",
@@ -2308,21 +2361,21 @@ class AgentsForAmazonBedrock:
                                                     ]["parameters"][0]["name"]
                                                     == "input_text"
                                                 ):
-                                                    print(
+                                                    _trace_print(
                                                         colored(
                                                             f"{_input['actionGroupInvocationInput']['parameters'][0]['value']}",
                                                             "magenta",
                                                         )
                                                     )
                                                 else:
-                                                    print(
+                                                    _trace_print(
                                                         colored(
                                                             f"{_input['actionGroupInvocationInput']['parameters']}\n",
                                                             "magenta",
                                                         )
                                                     )
                                             else:
-                                                print(
+                                                _trace_print(
                                                     colored(
                                                         f"    no input parameters being sent\n",
                                                         "magenta",
@@ -2343,20 +2396,20 @@ class AgentsForAmazonBedrock:
                                     _collab_ids = _collab_arn.split("/", 1)[1]
 
                                     if trace_level == "outline":
-                                        print(
+                                        _trace_print(
                                             colored(
                                                 f"Using sub-agent collaborator: '{_collab_name} [{_collab_ids}]'",
                                                 "magenta",
                                             )
                                         )
                                     else:
-                                        print(
+                                        _trace_print(
                                             colored(
                                                 f"Using sub-agent collaborator: '{_collab_name} [{_collab_ids}]' passing input text:",
                                                 "magenta",
                                             )
                                         )
-                                        print(
+                                        _trace_print(
                                             colored(
                                                 f"{_collab_input_text[0:TRACE_TRUNCATION_LENGTH]}\n",
                                                 "magenta",
@@ -2365,13 +2418,13 @@ class AgentsForAmazonBedrock:
 
                                 elif "codeInterpreterInvocationInput" in _input:
                                     if trace_level == "outline":
-                                        print(
+                                        _trace_print(
                                             colored(
                                                 f"Using code interpreter", "magenta"
                                             )
                                         )
                                     else:
-                                        console = Console()
+                                        console = Console(stderr=on_chunk is not None)
                                         _gen_code = _input[
                                             "codeInterpreterInvocationInput"
                                         ]["code"]
@@ -2383,7 +2436,7 @@ class AgentsForAmazonBedrock:
 
                                 elif "knowledgeBaseLookupInput" in _input:
                                     if trace_level == "outline":
-                                        print(
+                                        _trace_print(
                                             colored(f"Using knowledge base", "magenta")
                                         )
                                     else:
@@ -2393,19 +2446,19 @@ class AgentsForAmazonBedrock:
                                         _kb_query = _input["knowledgeBaseLookupInput"][
                                             "text"
                                         ]
-                                        print(
+                                        _trace_print(
                                             colored(
                                                 f"Using knowledge base id: {_kb_id} to search for:",
                                                 "magenta",
                                             )
                                         )
-                                        print(colored(f"  {_kb_query}\n", "magenta"))
+                                        _trace_print(colored(f"  {_kb_query}\n", "magenta"))
 
                             if "observation" in _orch:
                                 if trace_level == "core":
                                     _output = _orch["observation"]
                                     if "actionGroupInvocationOutput" in _output:
-                                        print(
+                                        _trace_print(
                                             colored(
                                                 f"--tool outputs:\n{_output['actionGroupInvocationOutput']['text'][0:TRACE_TRUNCATION_LENGTH]}...\n",
                                                 "magenta",
@@ -2419,7 +2472,7 @@ class AgentsForAmazonBedrock:
                                         _collab_output_text = _output[
                                             "agentCollaboratorInvocationOutput"
                                         ]["output"]["text"][0:TRACE_TRUNCATION_LENGTH]
-                                        print(
+                                        _trace_print(
                                             colored(
                                                 f"\n----sub-agent {_collab_name} output text:\n{_collab_output_text}...\n",
                                                 "magenta",
@@ -2431,7 +2484,7 @@ class AgentsForAmazonBedrock:
                                             "retrievedReferences"
                                         ]
                                         _ref_count = len(_refs)
-                                        print(
+                                        _trace_print(
                                             colored(
                                                 f"Knowledge base lookup output, {_ref_count} references:\n",
                                                 "magenta",
@@ -2439,7 +2492,7 @@ class AgentsForAmazonBedrock:
                                         )
                                         _curr = 1
                                         for _ref in _refs:
-                                            print(
+                                            _trace_print(
                                                 colored(
                                                     f"  ({_curr}) {_ref['content']['text'][0:TRACE_TRUNCATION_LENGTH]}...\n",
                                                     "magenta",
@@ -2448,7 +2501,7 @@ class AgentsForAmazonBedrock:
                                             _curr += 1
 
                                     if "finalResponse" in _output:
-                                        print(
+                                        _trace_print(
                                             colored(
                                                 f"Final response:\n{_output['finalResponse']['text'][0:TRACE_TRUNCATION_LENGTH]}...",
                                                 "cyan",
@@ -2458,7 +2511,7 @@ class AgentsForAmazonBedrock:
                         if "modelInvocationOutput" in _orch:
                             if _sub_agent_alias_id is not None:
                                 _sub_step += 1
-                                print(
+                                _trace_print(
                                     colored(
                                         f"---- Step {_orch_step}.{_sub_step} [using sub-agent name:{_sub_agent_name}, id:{_sub_agent_alias_id}] ----",
                                         "green",
@@ -2467,7 +2520,7 @@ class AgentsForAmazonBedrock:
                             else:
                                 _orch_step += 1
                                 _sub_step = 0
-                                print(colored(f"---- Step {_orch_step} ----", "green"))
+                                _trace_print(colored(f"---- Step {_orch_step} ----", "green"))
 
                             _total_llm_calls += 1
                             _orch_duration = (
@@ -2484,14 +2537,14 @@ class AgentsForAmazonBedrock:
                                 _out_tokens = _llm_usage["outputTokens"]
                                 _total_out_tokens += _out_tokens
 
-                                print(
+                                _trace_print(
                                     colored(
                                         f"Took {_orch_duration.total_seconds():,.1f}s, using {_in_tokens+_out_tokens} tokens (in: {_in_tokens}, out: {_out_tokens}) to complete prior action, observe, orchestrate.",
                                         "yellow",
                                     )
                                 )
                             else:
-                                print(
+                                _trace_print(
                                     colored(
                                         f"Took {_orch_duration.total_seconds():,.1f}s [token count metadata was not returned] to complete prior action, observe, orchestrate.",
                                         "yellow",
@@ -2515,13 +2568,13 @@ class AgentsForAmazonBedrock:
 
                             _total_llm_calls += 1
 
-                            print(
+                            _trace_print(
                                 colored(
                                     "Pre-processing trace, agent came up with an initial plan.",
                                     "yellow",
                                 )
                             )
-                            print(
+                            _trace_print(
                                 colored(
                                     f"Used LLM tokens, in: {_in_tokens}, out: {_out_tokens}",
                                     "yellow",
@@ -2541,8 +2594,8 @@ class AgentsForAmazonBedrock:
                             _total_out_tokens += _out_tokens
 
                             _total_llm_calls += 1
-                            print(colored("Agent post-processing complete.", "yellow"))
-                            print(
+                            _trace_print(colored("Agent post-processing complete.", "yellow"))
+                            _trace_print(
                                 colored(
                                     f"Used LLM tokens, in: {_in_tokens}, out: {_out_tokens}",
                                     "yellow",
@@ -2550,16 +2603,16 @@ class AgentsForAmazonBedrock:
                             )
 
                     if trace_level == "all":
-                        print(json.dumps(_event["trace"], indent=2))
+                        _trace_print(json.dumps(_event["trace"], indent=2))
 
                 if "files" in _event.keys() and enable_trace:
-                    console = Console()
+                    console = Console(stderr=on_chunk is not None)
                     files_event = _event["files"]
                     console.print(Markdown("**Files**"))
 
                     files_list = files_event["files"]
                     for this_file in files_list:
-                        print(f"{this_file['name']} ({this_file['type']})")
+                        _trace_print(f"{this_file['name']} ({this_file['type']})")
                         file_bytes = this_file["bytes"]
 
                         # save bytes to file, given the name of file and the bytes
@@ -2571,11 +2624,14 @@ class AgentsForAmazonBedrock:
                         #     # plt.imshow(img)
                         #     # plt.show()
 
+            # joined once instead of growing a string chunk by chunk
+            _agent_answer = "".join(_answer_chunks)
+
             if enable_trace:
                 duration = datetime.datetime.now() - _time_before_call
 
                 if trace_level in ["core", "outline"]:
-                    print(
+                    _trace_print(
                         colored(
                             f"Agent made a total of {_total_llm_calls} LLM calls, "
                             + f"using {_total_in_tokens+_total_out_tokens} tokens "
@@ -2586,10 +2642,10 @@ class AgentsForAmazonBedrock:
                     )
 
                 if trace_level == "all":
-                    print(f"Returning agent answer as: {_agent_answer}")
+                    _trace_print(f"Returning agent answer as: {_agent_answer}")
 
             if stream_final_response and enable_trace and trace_level == "all":
-                print(f"\nagent answer: ^^^{_agent_answer}^^^\n")
+                _trace_print(f"\nagent answer: ^^^{_agent_answer}^^^\n")
 
             _agent_answer = self._make_fully_cited_answer(
                 _agent_answer, _citations_event, enable_trace, trace_level
@@ -2598,13 +2654,13 @@ class AgentsForAmazonBedrock:
             return _agent_answer
 
         except Exception as e:
-            print(f"Caught exception while processing input to invokeAgent:\n")
-            print(f"  for input text:\n{input_text}\n")
-            print(f"  on agent: {agent_id}, alias: {agent_alias_id}")
-            print(
+            _trace_print(f"Caught exception while processing input to invokeAgent:\n")
+            _trace_print(f"  for input text:\n{input_text}\n")
+            _trace_print(f"  on agent: {agent_id}, alias: {agent_alias_id}")
+            _trace_print(
                 f"  request ID: {_agent_resp['ResponseMetadata']['RequestId']}, retries: {_agent_resp['ResponseMetadata']['RetryAttempts']}\n"
             )
-            print(f"Error: {e}")
+            _trace_print(f"Error: {e}")
             raise Exception("Unexpected exception: ", e)
 
     def invoke_roc(
@@ -0,0 +1,81 @@
+import datetime
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.utils import yaml_cache
+
+try:
+    import yaml
+except ImportError:  # PyYAML not installed
+    yaml = None
+
+
+@unittest.skipIf(yaml is None, "PyYAML is not installed")
+class TestLoadYaml(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.path = os.path.join(self.tmpdir, "agents.yaml")
+        self.sidecar_path = self.path + ".json"
+        yaml_cache.load_yaml_cached.cache_clear()
+        self.addCleanup(yaml_cache.load_yaml_cached.cache_clear)
+
+    def write_yaml(self, text, mtime):
+        with open(self.path, "w") as f:
+            f.write(text)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_repeated_load_is_served_from_cache(self):
+        self.write_yaml("agent:\n  role: researcher\n", 1000)
+        first = yaml_cache.load_yaml(self.path)
+        self.assertEqual(first, {"agent": {"role": "researcher"}})
+        self.assertIs(yaml_cache.load_yaml(self.path), first)
+        self.assertTrue(os.path.exists(self.sidecar_path))
+
+        # a fresh process reads the sidecar instead of parsing the YAML
+        yaml_cache.load_yaml_cached.cache_clear()
+        with mock.patch.object(yaml, "load", side_effect=AssertionError("YAML was parsed")):
+            self.assertEqual(yaml_cache.load_yaml(self.path), first)
+
+    def test_changed_content_is_reloaded(self):
+        self.write_yaml("agent:\n  role: researcher\n", 1000)
+        yaml_cache.load_yaml(self.path)
+        self.write_yaml("agent:\n  role: writer\n", 2000)
+        self.assertEqual(yaml_cache.load_yaml(self.path), {"agent": {"role": "writer"}})
+
+        # the sidecar is checked against the content, not the mtime
+        yaml_cache.load_yaml_cached.cache_clear()
+        self.write_yaml("agent:\n  role: editor\n", 2000)
+        self.assertEqual(yaml_cache.load_yaml(self.path), {"agent": {"role": "editor"}})
+
+    def test_stale_sidecar_is_ignored_and_replaced(self):
+        self.write_yaml("agent:\n  role: researcher\n", 1000)
+        with open(self.sidecar_path, "w") as f:
+            json.dump({"mtime": 1000, "sha256": "0" * 64, "content": {"agent": {"role": "stale"}}}, f)
+        self.assertEqual(yaml_cache.load_yaml(self.path), {"agent": {"role": "researcher"}})
+        with open(self.sidecar_path) as f:
+            self.assertEqual(json.load(f)["content"], {"agent": {"role": "researcher"}})
+
+    def test_corrupt_sidecar_is_ignored(self):
+        self.write_yaml("agent:\n  role: researcher\n", 1000)
+        with open(self.sidecar_path, "w") as f:
+            f.write("{not json")
+        self.assertEqual(yaml_cache.load_yaml(self.path), {"agent": {"role": "researcher"}})
+
+    def test_dates_skip_the_sidecar(self):
+        self.write_yaml("launch: 2024-06-01\n", 1000)
+        content = yaml_cache.load_yaml(self.path)
+        self.assertEqual(content, {"launch": datetime.date(2024, 6, 1)})
+        self.assertFalse(os.path.exists(self.sidecar_path))
+        self.assertFalse(os.path.exists(self.sidecar_path + ".tmp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
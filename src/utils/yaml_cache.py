@@ -0,0 +1,68 @@
+# Copyright 2024 Amazon.com and its affiliates; all rights reserved.
+# This file is AWS Content and may not be duplicated or distributed without permission
+
+"""
+Loading of the agents.yaml / tasks.yaml configuration files.
+
+Parsed content is kept in-process per (path, mtime), and on disk as a JSON sidecar
+(<path>.json) tagged with the SHA-256 of the YAML bytes, so a fresh process only pays
+for YAML parsing when the file has actually changed.
+"""
+import functools
+import hashlib
+import json
+import os
+from typing import Dict
+
+
+@functools.lru_cache(maxsize=32)
+def load_yaml_cached(path: str, mtime: float) -> Dict:
+    """Parse a YAML file once per modification time; callers must not mutate the result."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    sidecar_path = path + ".json"
+    try:
+        with open(sidecar_path, "r") as f:
+            sidecar = json.load(f)
+        if sidecar.get("sha256") == digest:
+            return sidecar["content"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    import yaml  # only needed when the sidecar is missing or stale
+
+    # libyaml's C loader when PyYAML was built with it
+    content = yaml.load(raw, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    _write_sidecar(sidecar_path, {"mtime": mtime, "sha256": digest, "content": content})
+    return content
+
+
+def _write_sidecar(sidecar_path: str, sidecar: Dict) -> None:
+    """Atomically write the sidecar, unless JSON cannot reproduce the content exactly.
+
+    Non-string keys and dates do not survive a JSON round trip; such files are only
+    cached in-process so warm and cold loads always agree.
+    """
+    try:
+        encoded = json.dumps(sidecar)
+        if json.loads(encoded) != sidecar:
+            return
+    except (TypeError, ValueError):
+        return
+    tmp_path = sidecar_path + ".tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(encoded)
+        os.replace(tmp_path, sidecar_path)
+    except OSError:
+        # read-only checkout; the in-process cache still applies
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def load_yaml(path: str) -> Dict:
+    """Load a YAML config through the cache above."""
+    return load_yaml_cached(path, os.path.getmtime(path))
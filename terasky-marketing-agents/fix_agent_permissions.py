@@ -1,21 +1,100 @@
 #!/usr/bin/env python
 
 import boto3
+import functools
 import json
+import time
+import uuid
+from botocore.exceptions import ClientError
+
+# List of agent role names
+AGENT_ROLES = (
+    'AmazonBedrockExecutionRoleForAgents_product_researcher',
+    'AmazonBedrockExecutionRoleForAgents_audience_researcher', 
+    'AmazonBedrockExecutionRoleForAgents_campaign_strategist',
+    'AmazonBedrockExecutionRoleForAgents_content_creator',
+    'AmazonBedrockExecutionRoleForAgents_qa_validator'
+)
+
+ROLE_PREFIX = 'AmazonBedrockExecutionRoleForAgents_'
+
+# Delays between propagation probes, in seconds
+PROPAGATION_BACKOFF = (0.5, 1, 2, 4, 8, 16)
+
+# Kept short so each probe is a single cheap model call
+PROBE_PROMPT = "Reply with OK."
+
+@functools.lru_cache(maxsize=None)
+def get_iam_client():
+    """Return the shared IAM client, built once per process."""
+    return boto3.client('iam')
+
+@functools.lru_cache(maxsize=None)
+def get_agent_clients():
+    """Return the shared (bedrock-agent, bedrock-agent-runtime) clients, built once per process."""
+    return boto3.client('bedrock-agent'), boto3.client('bedrock-agent-runtime')
+
+def _agent_ids():
+    """Map the agent name of each role in AGENT_ROLES to its agent ID, for agents that exist."""
+    names = {role_name[len(ROLE_PREFIX):] for role_name in AGENT_ROLES}
+    bedrock_agent_client, _ = get_agent_clients()
+    paginator = bedrock_agent_client.get_paginator('list_agents')
+    return {
+        agent['agentName']: agent['agentId']
+        for page in paginator.paginate()
+        for agent in page.get('agentSummaries', [])
+        if agent['agentName'] in names
+    }
+
+def _agent_has_access(agent_id):
+    """Invoke the agent once; False while its role is still denied access, True otherwise.
+    
+    Any other error (an unprepared agent, throttling) means the role itself is
+    already in effect, which is all the probe is after.
+    """
+    _, runtime_client = get_agent_clients()
+    try:
+        response = runtime_client.invoke_agent(
+            agentId=agent_id,
+            agentAliasId='TSTALIASID',
+            sessionId=uuid.uuid4().hex,
+            inputText=PROBE_PROMPT
+        )
+        # a denied model call surfaces as an error event in the stream
+        for _ in response['completion']:
+            pass
+    except ClientError as e:
+        return e.response.get('Error', {}).get('Code', '').lower() != 'accessdeniedexception'
+    return True
+
+def wait_for_policy_propagation(timeout=30):
+    """Probe the agents with exponential backoff until none is denied access to its model.
+    
+    IAM answers for an updated policy right away, but the agents only see it once
+    the change has propagated, so the agents themselves are probed. Returns True
+    once every existing agent gets through, False if the timeout is hit first.
+    """
+    pending = _agent_ids()
+    deadline = time.monotonic() + timeout
+    
+    for delay in (0,) + PROPAGATION_BACKOFF:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(delay, remaining))
+        
+        for agent_name, agent_id in list(pending.items()):
+            if _agent_has_access(agent_id):
+                del pending[agent_name]
+        if not pending:
+            return True
+    
+    return not pending
 
 def fix_agent_permissions():
     """Fix IAM permissions for existing Bedrock agent roles."""
     
-    iam_client = boto3.client('iam')
-    
-    # List of agent role names
-    agent_roles = [
-        'AmazonBedrockExecutionRoleForAgents_product_researcher',
-        'AmazonBedrockExecutionRoleForAgents_audience_researcher', 
-        'AmazonBedrockExecutionRoleForAgents_campaign_strategist',
-        'AmazonBedrockExecutionRoleForAgents_content_creator',
-        'AmazonBedrockExecutionRoleForAgents_qa_validator'
-    ]
+    iam_client = get_iam_client()
     
     # Enhanced inline policy for Bedrock access
     enhanced_policy = {
@@ -50,7 +129,7 @@ def fix_agent_permissions():
         'arn:aws:iam::aws:policy/service-role/AmazonBedrockExecutionRoleForAgents'
     ]
     
-    for role_name in agent_roles:
+    for role_name in AGENT_ROLES:
         try:
             print(f"Updating permissions for role: {role_name}")
             
@@ -90,7 +169,11 @@ def fix_agent_permissions():
             print(f"  ❌ Error processing role {role_name}: {str(e)}")
     
     print("\n🔄 Permission updates completed!")
-    print("⏰ Wait 2-3 minutes for IAM changes to propagate, then test again.")
 
 if __name__ == '__main__':
-    fix_agent_permissions() 
\ No newline at end of file
+    fix_agent_permissions()
+    print("⏰ Waiting for the agents to pick up the new permissions (up to 30 seconds)...")
+    if wait_for_policy_propagation(timeout=30):
+        print("✅ Agents can reach their models")
+    else:
+        print("⚠️  Timed out; IAM changes can take a few minutes to propagate, test again shortly.")
\ No newline at end of file
@@ -2,18 +2,34 @@
 
 import subprocess
 import sys
-import boto3
-import time
+import functools
+
+@functools.lru_cache(maxsize=None)
+def get_bedrock_agent_client():
+    """Return the shared bedrock-agent client, built once per process."""
+    import boto3
+    from botocore.config import Config
+    
+    session = boto3.Session()
+    return session.client(
+        'bedrock-agent',
+        config=Config(max_pool_connections=20, retries={'mode': 'adaptive', 'max_attempts': 5})
+    )
 
 def check_agents_exist():
     """Check if TeraSky marketing agents already exist."""
     try:
-        bedrock_agent_client = boto3.client('bedrock-agent')
-        response = bedrock_agent_client.list_agents()
-        agents = response.get('agentSummaries', [])
+        from simple_bedrock_agents import AGENT_NAMES
         
-        agent_names = ['product_researcher', 'audience_researcher', 'campaign_strategist', 'content_creator', 'qa_validator']
-        existing_agents = [agent['agentName'] for agent in agents if agent['agentName'] in agent_names]
+        bedrock_agent_client = get_bedrock_agent_client()
+        paginator = bedrock_agent_client.get_paginator('list_agents')
+        all_names = {
+            agent['agentName']
+            for page in paginator.paginate()
+            for agent in page.get('agentSummaries', [])
+        }
+        
+        existing_agents = sorted(all_names.intersection(AGENT_NAMES))
         
         return len(existing_agents), existing_agents
         
@@ -25,18 +41,20 @@ def create_agents():
     """Create the Bedrock agents."""
     print("🤖 Creating Bedrock agents...")
     try:
-        result = subprocess.run([
-            sys.executable, 'simple_bedrock_agents.py', 
+        # Run in-process so the interpreter, boto3 and its default session
+        # (and credential cache) are shared with the rest of the setup.
+        import simple_bedrock_agents
+        
+        args = simple_bedrock_agents.parse_args([
             '--product_key', 'hashicorp_vault',
             '--recreate_agents', 'true',
             '--cleanup_after', 'false'
-        ], capture_output=True, text=True)
-        
-        if result.returncode == 0:
+        ])
+        if simple_bedrock_agents.main(args):
             print("✅ Agents created successfully!")
             return True
         else:
-            print(f"❌ Error creating agents: {result.stderr}")
+            print("❌ Error creating agents, see the log above for details")
             return False
             
     except Exception as e:
@@ -47,16 +65,16 @@ def fix_permissions():
     """Fix agent permissions."""
     print("🔧 Fixing agent permissions...")
     try:
-        result = subprocess.run([sys.executable, 'fix_agent_permissions.py'], capture_output=True, text=True)
+        from fix_agent_permissions import fix_agent_permissions, wait_for_policy_propagation
         
-        if result.returncode == 0:
-            print("✅ Permissions updated!")
-            print("⏰ Waiting 30 seconds for IAM propagation...")
-            time.sleep(30)
-            return True
-        else:
-            print(f"❌ Error fixing permissions: {result.stderr}")
+        fix_agent_permissions()
+        print("✅ Permissions updated!")
+        print("⏰ Waiting for the agents to pick up the new permissions (up to 30 seconds)...")
+        if not wait_for_policy_propagation(timeout=30):
+            print("⚠️  Timed out waiting for IAM propagation; agents may be denied access for a few more minutes.")
             return False
+        print("✅ Agents can reach their models")
+        return True
             
     except Exception as e:
         print(f"❌ Error running permission fix: {str(e)}")
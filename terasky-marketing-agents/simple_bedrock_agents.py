@@ -5,20 +5,45 @@
 
 import sys
 from pathlib import Path
+import copy
 import datetime
 import traceback
-import yaml
-import uuid
-from textwrap import dedent
+import secrets
 import os
 import argparse
 import json
+import hashlib
+import functools
 import logging
-import boto3
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import atexit
 import time
+import asyncio
+from types import MappingProxyType, SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(str(Path(__file__).parent.parent))
+from src.utils.yaml_cache import load_yaml
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+class _UnformattedQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the handler behind the listener.
+
+    QueueHandler.prepare renders the message and traceback on the logging
+    thread; here the record is only copied, keeping msg, args and exc_info.
+    """
+    def prepare(self, record):
+        return copy.copy(record)
+
+# Configure logging: records are handed to a queue and formatted and written to
+# stderr by a background listener, so agent calls never block on either
+if not logging.getLogger().handlers:
+    _log_queue = queue.SimpleQueue()
+    _log_stream_handler = logging.StreamHandler()
+    _log_stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    _log_listener = QueueListener(_log_queue, _log_stream_handler)
+    logging.basicConfig(level=logging.INFO, handlers=[_UnformattedQueueHandler(_log_queue)])
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 # Get current directory for YAML files
@@ -26,16 +51,42 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 task_yaml_path = os.path.join(current_dir, "tasks.yaml")
 agent_yaml_path = os.path.join(current_dir, "agents.yaml")
 
-# AWS clients
-bedrock_client = boto3.client('bedrock-runtime')
-bedrock_agent_client = boto3.client('bedrock-agent')
-bedrock_agent_runtime_client = boto3.client('bedrock-agent-runtime')
-iam_client = boto3.client('iam')
-sts_client = boto3.client('sts')
+# Completed agent responses, keyed by a hash of agent, model, instructions and prompt
+LLM_CACHE_DIR = Path.home() / '.cache' / 'terasky_campaigns'
+# Cached responses older than this many seconds are ignored and refreshed
+LLM_CACHE_TTL = 24 * 60 * 60
 
-# Get AWS account info
-account_id = sts_client.get_caller_identity()["Account"]
-region = boto3.Session().region_name
+@functools.lru_cache(maxsize=None)
+def _aws():
+    """Create the AWS clients on first use.
+    
+    Deferred so that --help and argument errors never import boto3; the account
+    lookup is left to _account_id() so --clean_up never calls STS.
+    """
+    import boto3
+    from botocore.config import Config
+    
+    # Sized for concurrent agent creation and invocation, reusing connections across calls
+    client_config = Config(
+        max_pool_connections=32,
+        tcp_keepalive=True,
+        retries={'mode': 'adaptive', 'max_attempts': 6}
+    )
+    sts_client = boto3.client('sts', config=client_config)
+    return SimpleNamespace(
+        bedrock_client=boto3.client('bedrock-runtime', config=client_config),
+        bedrock_agent_client=boto3.client('bedrock-agent', config=client_config),
+        bedrock_agent_runtime_client=boto3.client('bedrock-agent-runtime', config=client_config),
+        iam_client=boto3.client('iam', config=client_config),
+        sts_client=sts_client,
+        # the clients have already resolved the region; no need for another Session
+        region=sts_client.meta.region_name
+    )
+
+@functools.lru_cache(maxsize=None)
+def _account_id() -> str:
+    """Look up the AWS account ID once per process."""
+    return _aws().sts_client.get_caller_identity()["Account"]
 
 # Product catalog
 PRODUCTS = {
@@ -65,9 +116,213 @@ PRODUCTS = {
     }
 }
 
+# Marketing agents and their roles, in pipeline order
+AGENT_DEFINITIONS = (
+    ('product_researcher', 'Product Research Specialist'),
+    ('audience_researcher', 'Target Audience Analyst'),
+    ('campaign_strategist', 'Campaign Strategy Director'),
+    ('content_creator', 'Marketing Content Creator'),
+    ('qa_validator', 'Quality Assurance Specialist')
+)
+AGENT_NAMES = tuple(name for name, _ in AGENT_DEFINITIONS)
+
+# Delays between create_agent retries while a new IAM role propagates, in seconds
+ROLE_PROPAGATION_BACKOFF = (0.5, 1, 1, 2, 2, 4, 8)
+
+# Upper bound on agent invocations in flight at once
+MAX_CONCURRENT_INVOCATIONS = 4
+
+# Prompt template inputs per product, built once and read-only so runs share them
+for _key, _product in PRODUCTS.items():
+    _product['inputs'] = MappingProxyType({
+        'product_name': _product['name'],
+        'product_description': _product['description'],
+        'product_key': _key
+    })
+
+# The catalog is fixed once the inputs are attached; keep it read-only from here on
+PRODUCTS = MappingProxyType(PRODUCTS)
+PRODUCT_KEYS = tuple(PRODUCTS)
+
+# Use orjson for encoding when it is installed, falling back to the stdlib
+try:
+    import orjson
+    
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+    
+except ImportError:
+    _json_dumps = json.dumps
+
+@functools.lru_cache(maxsize=64)
+def _get_or_create_role(role_name: str, agent_name: str) -> str:
+    """Return the ARN of the agent's execution role, creating it if needed.
+    
+    Memoized per process, so repeated lookups for the same role skip IAM.
+    """
+    iam_client = _aws().iam_client
+    
+    trust_policy = {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": {
+                    "Service": "bedrock.amazonaws.com"
+                },
+                "Action": "sts:AssumeRole"
+            }
+        ]
+    }
+    
+    try:
+        # Create the role directly; an existing one is reported as a conflict,
+        # which saves a get_role round-trip when the role is new
+        response = iam_client.create_role(
+            RoleName=role_name,
+            AssumeRolePolicyDocument=_json_dumps(trust_policy),
+            Description=f"Execution role for Bedrock agent {agent_name}"
+        )
+    except iam_client.exceptions.EntityAlreadyExistsException:
+        # Roles are created on the default path, so the ARN follows from the name
+        aws = _aws()
+        role_arn = f"arn:{aws.sts_client.meta.partition}:iam::{_account_id()}:role/{role_name}"
+        logger.info(f"Using existing role: {role_arn}")
+    else:
+        role_arn = response['Role']['Arn']
+        
+        # Attach comprehensive Bedrock policies
+        policies_to_attach = [
+            'arn:aws:iam::aws:policy/AmazonBedrockFullAccess',
+            'arn:aws:iam::aws:policy/service-role/AmazonBedrockExecutionRoleForAgents'
+        ]
+        
+        for policy_arn in policies_to_attach:
+            try:
+                iam_client.attach_role_policy(
+                    RoleName=role_name,
+                    PolicyArn=policy_arn
+                )
+            except Exception as e:
+                logger.warning(f"Could not attach policy {policy_arn}: {str(e)}")
+        
+        # Add inline policy for additional permissions
+        inline_policy = {
+            "Version": "2012-10-17",
+            "Statement": [
+                {
+                    "Effect": "Allow",
+                    "Action": [
+                        "bedrock:InvokeModel",
+                        "bedrock:InvokeModelWithResponseStream",
+                        "bedrock:GetFoundationModel",
+                        "bedrock:ListFoundationModels"
+                    ],
+                    "Resource": "*"
+                }
+            ]
+        }
+        
+        try:
+            iam_client.put_role_policy(
+                RoleName=role_name,
+                PolicyName=f"{role_name}_BedrockAccess",
+                PolicyDocument=_json_dumps(inline_policy)
+            )
+        except Exception as e:
+            logger.warning(f"Could not add inline policy: {str(e)}")
+        
+        logger.info(f"Created new role: {role_arn}")
+    
+    return role_arn
+
+# Prompt templates for the campaign steps, filled from a product's 'inputs' plus
+# excerpts of the earlier steps' output
+PRODUCT_RESEARCH_PROMPT = """
+        Conduct comprehensive research on TeraSky's {product_name} solution.
+        
+        Product: {product_name}
+        Description: {product_description}
+        
+        Analyze:
+        - Key features and capabilities
+        - Competitive advantages
+        - Target market
+        - Value propositions
+        - Technical specifications
+        - Market positioning
+        
+        Provide a detailed analysis in JSON format.
+        """
+
+AUDIENCE_RESEARCH_PROMPT = """
+        Based on the product research for {product_name}, analyze the target audience.
+        
+        Product Research Results: {product_research}...
+        
+        Identify:
+        - Target personas and roles
+        - Company profiles
+        - Pain points and challenges
+        - Decision-making processes
+        - Communication preferences
+        - Budget considerations
+        
+        Provide analysis in JSON format.
+        """
+
+CAMPAIGN_STRATEGY_PROMPT = """
+        Develop a comprehensive marketing strategy for {product_name}.
+        
+        Product Research: {product_research}...
+        Audience Research: {audience_research}...
+        
+        Create:
+        - Campaign objectives and metrics
+        - Channel strategy
+        - Content strategy
+        - Targeting approach
+        - Timeline and phases
+        - Budget recommendations
+        
+        Provide strategy in JSON format.
+        """
+
+CONTENT_CREATION_PROMPT = """
+        Create compelling marketing content for {product_name}.
+        
+        Strategy: {campaign_strategy}...
+        
+        Create content for:
+        - Social media (LinkedIn, Twitter, Facebook)
+        - Email marketing
+        - Blog articles
+        - Ad copy
+        - Landing pages
+        
+        Maintain TeraSky's professional brand voice. Provide in JSON format.
+        """
+
+QA_REVIEW_PROMPT = """
+        Review and validate the marketing campaign for {product_name}.
+        
+        Content to Review: {content}...
+        
+        Evaluate:
+        - Technical accuracy
+        - Brand alignment
+        - Audience fit
+        - Content quality
+        - Compliance
+        
+        Provide assessment and recommendations in JSON format.
+        """
+
 class SimpleBedrockAgent:
     """Simplified Bedrock Agent that works with current API."""
     
+    __slots__ = ('name', 'role', 'instructions', 'model_id', 'agent_id', 'agent_arn', 'role_arn')
+    
     def __init__(self, name: str, role: str, instructions: str, model_id: str = "us.anthropic.claude-3-5-sonnet-20241022-v2:0"):
         self.name = name
         self.role = role
@@ -80,86 +335,15 @@ class SimpleBedrockAgent:
     def create_agent_role(self):
         """Create IAM role for the agent."""
         role_name = f"AmazonBedrockExecutionRoleForAgents_{self.name}"
-        
-        trust_policy = {
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Effect": "Allow",
-                    "Principal": {
-                        "Service": "bedrock.amazonaws.com"
-                    },
-                    "Action": "sts:AssumeRole"
-                }
-            ]
-        }
-        
-        try:
-            # Try to get existing role
-            response = iam_client.get_role(RoleName=role_name)
-            self.role_arn = response['Role']['Arn']
-            logger.info(f"Using existing role: {self.role_arn}")
-        except iam_client.exceptions.NoSuchEntityException:
-            # Create new role
-            response = iam_client.create_role(
-                RoleName=role_name,
-                AssumeRolePolicyDocument=json.dumps(trust_policy),
-                Description=f"Execution role for Bedrock agent {self.name}"
-            )
-            self.role_arn = response['Role']['Arn']
-            
-            # Attach comprehensive Bedrock policies
-            policies_to_attach = [
-                'arn:aws:iam::aws:policy/AmazonBedrockFullAccess',
-                'arn:aws:iam::aws:policy/service-role/AmazonBedrockExecutionRoleForAgents'
-            ]
-            
-            for policy_arn in policies_to_attach:
-                try:
-                    iam_client.attach_role_policy(
-                        RoleName=role_name,
-                        PolicyArn=policy_arn
-                    )
-                except Exception as e:
-                    logger.warning(f"Could not attach policy {policy_arn}: {str(e)}")
-            
-            # Add inline policy for additional permissions
-            inline_policy = {
-                "Version": "2012-10-17",
-                "Statement": [
-                    {
-                        "Effect": "Allow",
-                        "Action": [
-                            "bedrock:InvokeModel",
-                            "bedrock:InvokeModelWithResponseStream",
-                            "bedrock:GetFoundationModel",
-                            "bedrock:ListFoundationModels"
-                        ],
-                        "Resource": "*"
-                    }
-                ]
-            }
-            
-            try:
-                iam_client.put_role_policy(
-                    RoleName=role_name,
-                    PolicyName=f"{role_name}_BedrockAccess",
-                    PolicyDocument=json.dumps(inline_policy)
-                )
-            except Exception as e:
-                logger.warning(f"Could not add inline policy: {str(e)}")
-            
-            logger.info(f"Created new role: {self.role_arn}")
-            
-            # Wait for role to be available
-            time.sleep(10)
+        self.role_arn = _get_or_create_role(role_name, self.name)
     
     def wait_for_agent_ready(self):
         """Wait for agent to be in a ready state."""
         if not self.agent_id:
             return
+        bedrock_agent_client = _aws().bedrock_agent_client
             
-        max_attempts = 30  # Wait up to 5 minutes
+        max_attempts = 150  # Wait up to 5 minutes
         attempt = 0
         
         while attempt < max_attempts:
@@ -172,7 +356,7 @@ class SimpleBedrockAgent:
                     return
                 elif status in ['CREATING', 'UPDATING', 'PREPARING']:
                     logger.info(f"Agent {self.name} is still {status}, waiting...")
-                    time.sleep(10)
+                    time.sleep(2)
                     attempt += 1
                 else:
                     logger.warning(f"Agent {self.name} is in state: {status}")
@@ -180,26 +364,53 @@ class SimpleBedrockAgent:
                     
             except Exception as e:
                 logger.error(f"Error checking agent status: {str(e)}")
-                time.sleep(10)
+                time.sleep(2)
                 attempt += 1
         
         logger.warning(f"Agent {self.name} did not become ready within expected time")
     
+    def wait_for_agent_prepared(self, timeout: float = 60):
+        """Poll until the agent reports PREPARED; returns False if it fails or times out."""
+        bedrock_agent_client = _aws().bedrock_agent_client
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            status = bedrock_agent_client.get_agent(agentId=self.agent_id)['agent']['agentStatus']
+            if status == 'PREPARED':
+                logger.info(f"Agent {self.name} is prepared")
+                return True
+            if status == 'FAILED':
+                logger.error(f"Agent {self.name} failed to prepare")
+                return False
+            time.sleep(1)
+        
+        logger.warning(f"Agent {self.name} was not prepared within {timeout}s")
+        return False
+    
     def create(self):
         """Create the Bedrock agent."""
+        bedrock_agent_client = _aws().bedrock_agent_client
         try:
             # Create IAM role first
             self.create_agent_role()
             
-            # Create the agent
-            response = bedrock_agent_client.create_agent(
-                agentName=self.name,
-                agentResourceRoleArn=self.role_arn,
-                description=f"{self.role} - {self.instructions[:100]}...",
-                foundationModel=self.model_id,
-                instruction=self.instructions,
-                idleSessionTTLInSeconds=1800
-            )
+            # Create the agent; a freshly created role is rejected until IAM has
+            # propagated it, so retry that validation error with backoff
+            for delay in ROLE_PROPAGATION_BACKOFF + (None,):
+                try:
+                    response = bedrock_agent_client.create_agent(
+                        agentName=self.name,
+                        agentResourceRoleArn=self.role_arn,
+                        description=f"{self.role} - {self.instructions[:100]}...",
+                        foundationModel=self.model_id,
+                        instruction=self.instructions,
+                        idleSessionTTLInSeconds=1800
+                    )
+                    break
+                except bedrock_agent_client.exceptions.ValidationException:
+                    if delay is None:
+                        raise
+                    logger.info(f"Role for {self.name} not usable yet, retrying in {delay}s")
+                    time.sleep(delay)
             
             self.agent_id = response['agent']['agentId']
             self.agent_arn = response['agent']['agentArn']
@@ -214,37 +425,64 @@ class SimpleBedrockAgent:
             logger.info(f"Prepared agent {self.name}")
             
             # Wait for agent to be ready after preparation
-            time.sleep(10)
-            
-            return True
+            return self.wait_for_agent_prepared()
             
         except Exception as e:
             logger.error(f"Error creating agent {self.name}: {str(e)}")
             return False
     
-    def invoke(self, prompt: str, session_id: str = None) -> str:
-        """Invoke the agent with a prompt."""
+    def invoke(self, prompt: str, session_id: str = None, use_cache: bool = False) -> str:
+        """Invoke the agent with a prompt.
+        
+        With use_cache, a completion from this agent for the same model, instructions
+        and prompt is served from LLM_CACHE_DIR for up to LLM_CACHE_TTL seconds instead
+        of calling the agent again. Recreated agents get a new ID and start afresh.
+        """
         if not self.agent_id:
             raise Exception(f"Agent {self.name} not created yet")
             
         if not session_id:
-            session_id = str(uuid.uuid4())
+            session_id = secrets.token_hex(16)
+        
+        if use_cache:
+            cache_key = hashlib.sha256(
+                '\0'.join((self.agent_id, self.model_id, self.instructions, prompt)).encode('utf-8')
+            ).hexdigest()
+            cache_path = LLM_CACHE_DIR / cache_key
+            try:
+                if time.time() - cache_path.stat().st_mtime < LLM_CACHE_TTL:
+                    result = cache_path.read_text(encoding='utf-8')
+                    logger.info(f"Using cached response for agent {self.name}")
+                    return result
+            except OSError:
+                pass
         
         try:
-            response = bedrock_agent_runtime_client.invoke_agent(
+            response = _aws().bedrock_agent_runtime_client.invoke_agent(
                 agentId=self.agent_id,
                 agentAliasId='TSTALIASID',
                 sessionId=session_id,
                 inputText=prompt
             )
             
-            # Extract response from event stream
-            result = ""
+            # Extract response from event stream; collect raw bytes and decode once,
+            # which also keeps multi-byte characters split across chunks intact
+            result = bytearray()
             for event in response['completion']:
-                if 'chunk' in event:
-                    chunk = event['chunk']
-                    if 'bytes' in chunk:
-                        result += chunk['bytes'].decode('utf-8')
+                data = event.get('chunk', {}).get('bytes')
+                if data:
+                    result.extend(data)
+            result = result.decode('utf-8')
+            
+            # failed calls go to the except below and are never cached; neither are empty answers
+            if use_cache and result.strip():
+                try:
+                    LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                    tmp_path = cache_path.with_suffix('.tmp')
+                    tmp_path.write_text(result, encoding='utf-8')
+                    os.replace(tmp_path, cache_path)
+                except OSError as e:
+                    logger.debug("Could not cache response for agent %s: %s", self.name, e)
             
             return result
             
@@ -254,6 +492,7 @@ class SimpleBedrockAgent:
     
     def delete(self):
         """Delete the agent."""
+        bedrock_agent_client = _aws().bedrock_agent_client
         if self.agent_id:
             try:
                 bedrock_agent_client.delete_agent(agentId=self.agent_id)
@@ -264,26 +503,19 @@ class SimpleBedrockAgent:
 class SimpleMarketingCampaignGenerator:
     """Simplified marketing campaign generator using individual Bedrock agents."""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = False):
         self.agents = {}
-        self.session_id = str(uuid.uuid4())
+        self.session_id = secrets.token_hex(16)
+        self.use_cache = use_cache
         
     def create_agents(self):
         """Create all the marketing agents."""
         
         # Load agent configurations
-        with open(agent_yaml_path, 'r') as file:
-            agent_configs = yaml.safe_load(file)
-        
-        agent_definitions = [
-            ('product_researcher', 'Product Research Specialist'),
-            ('audience_researcher', 'Target Audience Analyst'),
-            ('campaign_strategist', 'Campaign Strategy Director'),
-            ('content_creator', 'Marketing Content Creator'),
-            ('qa_validator', 'Quality Assurance Specialist')
-        ]
+        agent_configs = load_yaml(agent_yaml_path)
+        _aws()  # build the clients once, before the worker threads need them
         
-        for agent_key, role in agent_definitions:
+        def build(agent_key, role):
             config = agent_configs.get(agent_key, {})
             instructions = config.get('instructions', f"You are a {role} for TeraSky marketing campaigns.")
             model_id = config.get('llm', 'us.anthropic.claude-3-5-sonnet-20241022-v2:0')
@@ -294,225 +526,280 @@ class SimpleMarketingCampaignGenerator:
                 instructions=instructions,
                 model_id=model_id
             )
-            
-            if agent.create():
+            return agent if agent.create() else None
+        
+        # Each agent has its own IAM role and Bedrock resources, so the
+        # mostly-waiting create calls can overlap
+        with ThreadPoolExecutor(max_workers=len(AGENT_DEFINITIONS)) as executor:
+            created = list(executor.map(lambda definition: build(*definition), AGENT_DEFINITIONS))
+        
+        success = True
+        for (agent_key, _), agent in zip(AGENT_DEFINITIONS, created):
+            if agent is not None:
                 self.agents[agent_key] = agent
                 logger.info(f"Successfully created agent: {agent_key}")
             else:
                 logger.error(f"Failed to create agent: {agent_key}")
-                return False
+                success = False
         
-        return True
+        return success
     
     def generate_campaign(self, product_key: str) -> dict:
         """Generate a marketing campaign for the specified product."""
+        return asyncio.run(self.generate_campaign_async(product_key))
+    
+    def generate_campaign_batch(self, product_keys: list) -> list:
+        """Generate campaigns for several products concurrently.
+        
+        Returns one entry per product key, in order: the results dict, or the
+        exception raised while generating that product's campaign.
+        """
+        return asyncio.run(self._generate_campaign_batch_async(product_keys))
+    
+    async def _generate_campaign_batch_async(self, product_keys: list) -> list:
+        # One limit across every campaign, and a session per product so the
+        # agents do not carry one product's context into another's
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_INVOCATIONS)
+        return await asyncio.gather(
+            *(self.generate_campaign_async(key, session_id=secrets.token_hex(16), semaphore=semaphore)
+              for key in product_keys),
+            return_exceptions=True
+        )
+    
+    async def generate_campaign_async(self, product_key: str, session_id: str = None,
+                                      semaphore: asyncio.Semaphore = None) -> dict:
+        """Generate a campaign; each step consumes the output of the one before it.
+        
+        The steps of one campaign run in order; generate_campaign_batch overlaps
+        whole campaigns for different products.
+        """
+        session_id = session_id or self.session_id
         
         product_info = PRODUCTS.get(product_key)
         if not product_info:
             raise Exception(f"Product {product_key} not found")
+        inputs = product_info['inputs']
         
-        campaign_id = f"terasky-campaign-{str(uuid.uuid4())}"
+        campaign_id = f"terasky-campaign-{secrets.token_hex(16)}"
         results = {
             'campaign_id': campaign_id,
-            'product': product_info,
+            # a plain copy: the catalog entry is shared and its inputs proxy is not JSON-serializable
+            'product': {**product_info, 'inputs': dict(inputs)},
             'timestamp': datetime.datetime.now().isoformat(),
-            'results': {}
+            'results': {},
+            'timings': {}
         }
         
-        # Step 1: Product Research
-        logger.info("Step 1: Product Research")
-        product_prompt = f"""
-        Conduct comprehensive research on TeraSky's {product_info['name']} solution.
+        # Bound concurrent invoke_agent calls to stay clear of Bedrock throttling
+        semaphore = semaphore or asyncio.Semaphore(MAX_CONCURRENT_INVOCATIONS)
         
-        Product: {product_info['name']}
-        Description: {product_info['description']}
+        async def run_step(step, agent_key, prompt):
+            async with semaphore:
+                started = time.perf_counter()
+                output = await asyncio.to_thread(self.agents[agent_key].invoke, prompt, session_id, self.use_cache)
+            results['timings'][step] = time.perf_counter() - started
+            return output
         
-        Analyze:
-        - Key features and capabilities
-        - Competitive advantages
-        - Target market
-        - Value propositions
-        - Technical specifications
-        - Market positioning
-        
-        Provide a detailed analysis in JSON format.
-        """
+        # Step 1: Product Research
+        logger.info("Step 1: Product Research")
+        product_prompt = PRODUCT_RESEARCH_PROMPT.format(**inputs)
         
-        product_research = self.agents['product_researcher'].invoke(product_prompt, self.session_id)
+        product_research = await run_step('product_research', 'product_researcher', product_prompt)
         results['results']['product_research'] = product_research
         
         # Step 2: Audience Research
         logger.info("Step 2: Audience Research")
-        audience_prompt = f"""
-        Based on the product research for {product_info['name']}, analyze the target audience.
-        
-        Product Research Results: {product_research[:1000]}...
-        
-        Identify:
-        - Target personas and roles
-        - Company profiles
-        - Pain points and challenges
-        - Decision-making processes
-        - Communication preferences
-        - Budget considerations
-        
-        Provide analysis in JSON format.
-        """
+        audience_prompt = AUDIENCE_RESEARCH_PROMPT.format(**inputs, product_research=product_research[:1000])
         
-        audience_research = self.agents['audience_researcher'].invoke(audience_prompt, self.session_id)
+        audience_research = await run_step('audience_research', 'audience_researcher', audience_prompt)
         results['results']['audience_research'] = audience_research
         
         # Step 3: Campaign Strategy
         logger.info("Step 3: Campaign Strategy")
-        strategy_prompt = f"""
-        Develop a comprehensive marketing strategy for {product_info['name']}.
-        
-        Product Research: {product_research[:500]}...
-        Audience Research: {audience_research[:500]}...
-        
-        Create:
-        - Campaign objectives and metrics
-        - Channel strategy
-        - Content strategy
-        - Targeting approach
-        - Timeline and phases
-        - Budget recommendations
+        strategy_prompt = CAMPAIGN_STRATEGY_PROMPT.format(
+            **inputs,
+            product_research=product_research[:500],
+            audience_research=audience_research[:500]
+        )
         
-        Provide strategy in JSON format.
-        """
-        
-        campaign_strategy = self.agents['campaign_strategist'].invoke(strategy_prompt, self.session_id)
+        campaign_strategy = await run_step('campaign_strategy', 'campaign_strategist', strategy_prompt)
         results['results']['campaign_strategy'] = campaign_strategy
         
         # Step 4: Content Creation
         logger.info("Step 4: Content Creation")
-        content_prompt = f"""
-        Create compelling marketing content for {product_info['name']}.
-        
-        Strategy: {campaign_strategy[:500]}...
+        content_prompt = CONTENT_CREATION_PROMPT.format(**inputs, campaign_strategy=campaign_strategy[:500])
         
-        Create content for:
-        - Social media (LinkedIn, Twitter, Facebook)
-        - Email marketing
-        - Blog articles
-        - Ad copy
-        - Landing pages
-        
-        Maintain TeraSky's professional brand voice. Provide in JSON format.
-        """
-        
-        content = self.agents['content_creator'].invoke(content_prompt, self.session_id)
+        content = await run_step('content', 'content_creator', content_prompt)
         results['results']['content'] = content
         
         # Step 5: Quality Assurance
         logger.info("Step 5: Quality Assurance")
-        qa_prompt = f"""
-        Review and validate the marketing campaign for {product_info['name']}.
+        qa_prompt = QA_REVIEW_PROMPT.format(**inputs, content=content[:500])
         
-        Content to Review: {content[:500]}...
-        
-        Evaluate:
-        - Technical accuracy
-        - Brand alignment
-        - Audience fit
-        - Content quality
-        - Compliance
-        
-        Provide assessment and recommendations in JSON format.
-        """
-        
-        qa_results = self.agents['qa_validator'].invoke(qa_prompt, self.session_id)
+        qa_results = await run_step('qa_results', 'qa_validator', qa_prompt)
         results['results']['qa_results'] = qa_results
         
         return results
     
     def cleanup_agents(self):
         """Delete all created agents."""
-        for agent in self.agents.values():
-            agent.delete()
+        with ThreadPoolExecutor(max_workers=max(len(self.agents), 1)) as executor:
+            list(executor.map(SimpleBedrockAgent.delete, self.agents.values()))
         self.agents.clear()
 
+def _delete_agent_role(agent_name: str):
+    """Detach and delete the policies of an agent's execution role, then the role itself."""
+    iam_client = _aws().iam_client
+    role_name = f"AmazonBedrockExecutionRoleForAgents_{agent_name}"
+    try:
+        for page in iam_client.get_paginator('list_attached_role_policies').paginate(RoleName=role_name):
+            for policy in page['AttachedPolicies']:
+                iam_client.detach_role_policy(RoleName=role_name, PolicyArn=policy['PolicyArn'])
+        for page in iam_client.get_paginator('list_role_policies').paginate(RoleName=role_name):
+            for policy_name in page['PolicyNames']:
+                iam_client.delete_role_policy(RoleName=role_name, PolicyName=policy_name)
+        iam_client.delete_role(RoleName=role_name)
+        logger.info(f"Deleted role {role_name}")
+    except iam_client.exceptions.NoSuchEntityException:
+        pass
+
+def _cleanup():
+    """Clean up the marketing agents without loading any campaign configuration."""
+    logger.info("Cleaning up agents...")
+    bedrock_agent_client = _aws().bedrock_agent_client
+    
+    paginator = bedrock_agent_client.get_paginator('list_agents')
+    agent_ids = {
+        agent['agentName']: agent['agentId']
+        for page in paginator.paginate()
+        for agent in page['agentSummaries']
+        if agent['agentName'] in AGENT_NAMES
+    }
+    
+    def delete(agent_name):
+        try:
+            if agent_name in agent_ids:
+                bedrock_agent_client.delete_agent(agentId=agent_ids[agent_name], skipResourceInUseCheck=True)
+                logger.info(f"Deleted agent {agent_name}")
+            _delete_agent_role(agent_name)
+            return True
+        except Exception as e:
+            logger.error(f"Error cleaning up agent {agent_name}: {str(e)}")
+            return False
+    
+    with ThreadPoolExecutor(max_workers=len(AGENT_NAMES)) as executor:
+        succeeded = all(list(executor.map(delete, AGENT_NAMES)))
+    _get_or_create_role.cache_clear()
+    
+    logger.info("Cleanup completed")
+    return succeeded
+
 def main(args):
-    """Main function to run the marketing campaign generation."""
+    """Main function to run the marketing campaign generation.
+
+    Returns True when the agents were created (or cleanup finished), False otherwise.
+    """
+    if args.clean_up:
+        return _cleanup()
+    return _run_campaign(args)
+
+def _print_campaign_results(results):
+    """Print a campaign's step outputs and timings."""
+    print("\n" + "="*80)
+    print("MARKETING CAMPAIGN RESULTS")
+    print("="*80)
+    print(f"Campaign ID: {results['campaign_id']}")
+    print(f"Product: {results['product']['name']}")
+    print(f"Description: {results['product']['description']}")
+    print("="*80)
+    
+    for step, result in results['results'].items():
+        print(f"\n{step.upper()}:")
+        print("-" * 40)
+        print(result[:500] + "..." if len(result) > 500 else result)
     
-    # Handle cleanup
-    if args.clean_up == "true":
-        logger.info("Cleaning up agents...")
-        # Note: This is a simplified cleanup - in production you'd want to list and delete all agents
-        logger.info("Cleanup completed")
-        return
+    print("="*80)
+    print("STEP TIMINGS")
+    print("-" * 40)
+    for step, seconds in results['timings'].items():
+        print(f"{step:<20} {seconds:>8,.1f} s")
+    print("="*80)
+
+def _run_campaign(args):
+    """Create the agents and generate a campaign for args.product_key (or each of args.product_keys)."""
+
+    product_keys = args.product_keys.split(',') if args.product_keys else [args.product_key]
 
     # Get product information
-    product_info = PRODUCTS.get(args.product_key)
-    if not product_info:
-        logger.error(f"Product {args.product_key} not found. Available products: {list(PRODUCTS.keys())}")
-        return
+    for product_key in product_keys:
+        if product_key not in PRODUCTS:
+            logger.error(f"Product {product_key} not found. Available products: {list(PRODUCT_KEYS)}")
+            return False
 
-    logger.info(f"Generating marketing campaign for: {product_info['name']}")
+    logger.info(f"Generating marketing campaign for: {', '.join(PRODUCTS[key]['name'] for key in product_keys)}")
 
     try:
         # Create campaign generator
-        campaign_generator = SimpleMarketingCampaignGenerator()
+        campaign_generator = SimpleMarketingCampaignGenerator(use_cache=not args.no_cache)
         
         # Create agents
         logger.info("Creating Bedrock Agents...")
         if not campaign_generator.create_agents():
             logger.error("Failed to create agents")
-            return
+            return False
         
         logger.info("All agents created successfully!")
         
-        if args.recreate_agents == "false" or True:  # Always run for now
+        if not args.recreate_agents or True:  # Always run for now
             logger.info("Starting campaign generation...")
             
-            time_before_call = datetime.datetime.now()
-            logger.info(f"Start time: {time_before_call}")
+            logger.info(f"Start time: {datetime.datetime.now()}")
+            time_before_call = time.perf_counter()
             
             try:
                 # Generate campaign
-                results = campaign_generator.generate_campaign(args.product_key)
-                
-                logger.info("Campaign generation completed successfully!")
-                print("\n" + "="*80)
-                print("MARKETING CAMPAIGN RESULTS")
-                print("="*80)
-                print(f"Campaign ID: {results['campaign_id']}")
-                print(f"Product: {results['product']['name']}")
-                print(f"Description: {results['product']['description']}")
-                print("="*80)
-                
-                for step, result in results['results'].items():
-                    print(f"\n{step.upper()}:")
-                    print("-" * 40)
-                    print(result[:500] + "..." if len(result) > 500 else result)
+                if len(product_keys) == 1:
+                    all_results = [campaign_generator.generate_campaign(product_keys[0])]
+                else:
+                    all_results = campaign_generator.generate_campaign_batch(product_keys)
                 
-                print("="*80)
+                for product_key, results in zip(product_keys, all_results):
+                    if isinstance(results, Exception):
+                        logger.error(f"Error during campaign generation for {product_key}: {str(results)}")
+                        continue
+                    logger.info("Campaign generation completed successfully!")
+                    _print_campaign_results(results)
                 
             except Exception as e:
                 logger.error(f"Error during campaign generation: {str(e)}")
                 traceback.print_exc()
             finally:
                 # Cleanup agents (default behavior for demo)
-                if args.cleanup_after == "true" or args.cleanup_after == "false":
-                    cleanup = args.cleanup_after == "true"
-                else:
-                    cleanup = True  # Default to cleanup for demo
-                    
-                if cleanup:
+                if args.cleanup_after:
                     logger.info("Cleaning up agents...")
                     campaign_generator.cleanup_agents()
 
-            duration = datetime.datetime.now() - time_before_call
-            logger.info(f"Total time taken: {duration.total_seconds():,.1f} seconds")
+            duration = time.perf_counter() - time_before_call
+            logger.info(f"Total time taken: {duration:,.1f} seconds")
             
         else:
             logger.info("Agents created successfully. Use --recreate_agents false to run campaign generation.")
 
+        return True
+
     except Exception as e:
         logger.error(f"Error in main execution: {str(e)}")
         traceback.print_exc()
+        return False
 
-if __name__ == '__main__':
+def _str_to_bool(value):
+    """argparse type for the "true"/"false" flags, so args arrive as real booleans."""
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    raise argparse.ArgumentTypeError(f"expected 'true' or 'false', got '{value}'")
+
+def parse_args(argv=None):
+    """Parse command line arguments; pass argv to drive main() in-process."""
     # Default values
     default_inputs = {
         'product_key': 'hashicorp_vault',
@@ -524,7 +811,8 @@ if __name__ == '__main__':
     parser.add_argument(
         "--recreate_agents", 
         required=False, 
-        default='true', 
+        default=True, 
+        type=_str_to_bool,
         help="False if reusing existing agents (default: true)"
     )
     
@@ -532,8 +820,15 @@ if __name__ == '__main__':
         "--product_key", 
         required=False, 
         default=default_inputs['product_key'],
-        choices=list(PRODUCTS.keys()),
-        help=f"The product to generate a campaign for. Options: {list(PRODUCTS.keys())} (default: {default_inputs['product_key']})"
+        choices=PRODUCT_KEYS,
+        help=f"The product to generate a campaign for. Options: {list(PRODUCT_KEYS)} (default: {default_inputs['product_key']})"
+    )
+    
+    parser.add_argument(
+        "--product_keys",
+        required=False,
+        default=None,
+        help="Comma-separated products to generate campaigns for concurrently; overrides --product_key"
     )
     
     parser.add_argument(
@@ -544,32 +839,48 @@ if __name__ == '__main__':
         help="The level of trace detail (default: core)"
     )
     
+    parser.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        help=f"Always call the agents instead of reusing cached responses from {LLM_CACHE_DIR}"
+    )
+    
     parser.add_argument(
         "--clean_up",
         required=False,
-        default="false",
+        default=False,
+        type=_str_to_bool,
         help="Cleanup all agents and exit (default: false)",
     )
     
     parser.add_argument(
         "--cleanup_after",
         required=False,
-        default="false",
+        default=False,
+        type=_str_to_bool,
         help="Cleanup agents after campaign generation (default: false)",
     )
 
-    args = parser.parse_args()
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
     
     # Display configuration
-    print("\n" + "="*60)
-    print("TERASKY MARKETING CAMPAIGN GENERATOR")
-    print("Powered by Amazon Bedrock Agents (Simplified)")
-    print("="*60)
-    print(f"Product: {PRODUCTS[args.product_key]['name']}")
-    print(f"Description: {PRODUCTS[args.product_key]['description']}")
-    print(f"Recreate Agents: {args.recreate_agents}")
-    print(f"AWS Region: {region}")
-    print(f"Account ID: {account_id}")
-    print("="*60)
+    if not args.clean_up:
+        print("\n" + "="*60)
+        print("TERASKY MARKETING CAMPAIGN GENERATOR")
+        print("Powered by Amazon Bedrock Agents (Simplified)")
+        print("="*60)
+        if args.product_keys:
+            print(f"Products: {args.product_keys}")
+        else:
+            print(f"Product: {PRODUCTS[args.product_key]['name']}")
+            print(f"Description: {PRODUCTS[args.product_key]['description']}")
+        print(f"Recreate Agents: {args.recreate_agents}")
+        print(f"AWS Region: {_aws().region}")
+        print(f"Account ID: {_account_id()}")
+        print("="*60)
     
     main(args) 
\ No newline at end of file
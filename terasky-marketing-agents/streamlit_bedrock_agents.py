@@ -4,19 +4,21 @@
 # This file is AWS Content and may not be duplicated or distributed without permission
 
 import streamlit as st
-import sys
-from pathlib import Path
 import datetime
-import traceback
-import yaml
 import uuid
-from textwrap import dedent
-import os
+import hashlib
+import codecs
 import json
+import os
 import logging
 import boto3
-import time
-from typing import Dict, List, Optional
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from time import perf_counter, sleep
+import random
+import threading
+from collections import OrderedDict, deque
+from itertools import islice
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,36 +29,105 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 task_yaml_path = os.path.join(current_dir, "tasks.yaml")
 agent_yaml_path = os.path.join(current_dir, "agents.yaml")
 
+# Oldest activity entries are dropped past this many
+ACTIVITY_LOG_SIZE = 200
+
 # Initialize session state for agent activity tracking
 if 'agent_activity_log' not in st.session_state:
-    st.session_state['agent_activity_log'] = []
+    st.session_state['agent_activity_log'] = deque(maxlen=ACTIVITY_LOG_SIZE)
 if 'current_session_id' not in st.session_state:
-    st.session_state['current_session_id'] = str(uuid.uuid4())
+    st.session_state['current_session_id'] = uuid.uuid4().hex
 if 'agent_invocation_count' not in st.session_state:
     st.session_state['agent_invocation_count'] = 0
+if 'latency_stats' not in st.session_state:
+    st.session_state['latency_stats'] = deque(maxlen=10)
+
+# Keep-alive connections and a pool large enough for concurrent agent calls
+AWS_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    connect_timeout=5,
+    read_timeout=120,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
 
 # AWS clients
+@st.cache_resource
 def get_aws_clients():
-    """Initialize AWS clients with caching."""
+    """Initialize AWS clients once per process; they are shared by all sessions."""
     return {
-        'bedrock_agent': boto3.client('bedrock-agent'),
-        'bedrock_agent_runtime': boto3.client('bedrock-agent-runtime'),
-        'iam': boto3.client('iam'),
-        'sts': boto3.client('sts')
+        'bedrock_agent': boto3.client('bedrock-agent', config=AWS_CLIENT_CONFIG),
+        'bedrock_agent_runtime': boto3.client('bedrock-agent-runtime', config=AWS_CLIENT_CONFIG),
+        'iam': boto3.client('iam', config=AWS_CLIENT_CONFIG),
+        'sts': boto3.client('sts', config=AWS_CLIENT_CONFIG)
     }
 
+AGENT_NAMES = frozenset(('product_researcher', 'audience_researcher', 'campaign_strategist',
+                         'content_creator', 'qa_validator'))
+AGENT_DISPLAY_NAMES = {
+    'product_researcher': 'Product Researcher',
+    'audience_researcher': 'Audience Researcher',
+    'campaign_strategist': 'Campaign Strategist',
+    'content_creator': 'Content Creator',
+    'qa_validator': 'QA Validator'
+}
+USABLE_AGENT_STATUSES = frozenset(('PREPARED', 'CREATED'))
+
+# Attempts per buffered agent call when its response stream fails with a transient error
+AGENT_CALL_ATTEMPTS = 3
+RETRYABLE_STREAM_ERRORS = frozenset((
+    'throttlingexception', 'serviceunavailableexception', 'internalserverexception'
+))
+
+# Identical prompts to the same agent reuse its answer for this long (seconds)
+RESPONSE_CACHE_TTL = 3600
+# Least recently used answers are dropped past this many
+RESPONSE_CACHE_SIZE = 256
+
+# The script body re-runs on every interaction, so state that must outlive a
+# rerun or be shared between sessions lives in st.cache_resource
+@st.cache_resource
+def _response_cache() -> tuple:
+    """Process-wide LRU {(agent_name, prompt digest): (expires_at, outcome)} of agent answers.
+
+    Returned with the lock guarding it, since every session's script thread uses it.
+    """
+    return OrderedDict(), threading.Lock()
+
 # Get AWS account info
+@st.cache_data(ttl=3600)
 def get_aws_info():
     """Get AWS account information."""
     clients = get_aws_clients()
     account_id = clients['sts'].get_caller_identity()["Account"]
-    region = boto3.Session().region_name
+    region = clients['sts'].meta.region_name
     return account_id, region
 
-def log_agent_activity(agent_name: str, agent_id: str, action: str, details: dict = None):
-    """Log agent activity for visitor visibility."""
+@st.cache_data(ttl=300)
+def _list_terasky_agents(account_id: str, region: str) -> dict:
+    """Return {agent_name: {'id', 'status'}} for the usable TeraSky marketing agents.
+    
+    Agent IDs rarely change, so the listing is shared for a few minutes; the
+    account and region are part of the cache key so they never get mixed up.
+    """
+    paginator = get_aws_clients()['bedrock_agent'].get_paginator('list_agents')
+    found = {}
+    
+    # Find TeraSky marketing agents, stopping as soon as all of them are in hand
+    for page in paginator.paginate(PaginationConfig={'PageSize': 100}):
+        for agent in page.get('agentSummaries', []):
+            agent_name = agent['agentName']
+            if agent_name in AGENT_NAMES and agent['agentStatus'] in USABLE_AGENT_STATUSES:
+                found[agent_name] = {'id': agent['agentId'], 'status': agent['agentStatus']}
+                if len(found) == len(AGENT_NAMES):
+                    return found
+    return found
+
+def log_agent_activity(agent_name: str, agent_id: str, action: str, details: dict = None,
+                       timestamp: str = None):
+    """Log agent activity for visitor visibility; timestamp defaults to now (ISO format)."""
     activity_entry = {
-        'timestamp': datetime.datetime.now().isoformat(),
+        'timestamp': timestamp or datetime.datetime.now().isoformat(),
         'agent_name': agent_name,
         'agent_id': agent_id,
         'action': action,
@@ -100,18 +171,190 @@ PRODUCTS = {
     }
 }
 
+# Selectbox and header label for each product
+PRODUCT_LABELS = {key: f"{product['icon']} {product['name']}" for key, product in PRODUCTS.items()}
+
+# Agent prompts, filled in with str.format for each campaign
+PRODUCT_RESEARCH_PROMPT = """
+            Conduct comprehensive research on TeraSky's {product_name} solution.
+            
+            Product: {product_name}
+            Description: {product_description}
+            
+            Analyze:
+            - Key features and capabilities
+            - Competitive advantages
+            - Target market
+            - Value propositions
+            - Technical specifications
+            - Market positioning
+            
+            Provide a detailed analysis in JSON format.
+            """
+
+AUDIENCE_RESEARCH_PROMPT = """
+            Based on the product research for {product_name}, analyze the target audience.
+            
+            Product Research Results: {product_research}...
+            
+            Identify:
+            - Target personas and roles
+            - Company profiles
+            - Pain points and challenges
+            - Decision-making processes
+            - Communication preferences
+            - Budget considerations
+            
+            Provide analysis in JSON format.
+            """
+
+CAMPAIGN_STRATEGY_PROMPT = """
+            Develop a comprehensive marketing strategy for {product_name}.
+            
+            Product Research: {product_research}...
+            Audience Research: {audience_research}...
+            
+            Create:
+            - Campaign objectives and metrics
+            - Channel strategy
+            - Content strategy
+            - Targeting approach
+            - Timeline and phases
+            - Budget recommendations
+            
+            Provide strategy in JSON format.
+            """
+
+CONTENT_CREATION_PROMPT = """
+            Create compelling marketing content for {product_name}.
+            
+            Strategy: {campaign_strategy}...
+            
+            Create content for:
+            - Social media (LinkedIn, Twitter, Facebook)
+            - Email marketing
+            - Blog articles
+            - Ad copy
+            - Landing pages
+            
+            Maintain TeraSky's professional brand voice. Provide in JSON format.
+            """
+
+QA_REVIEW_PROMPT = """
+            Review and validate the marketing campaign for {product_name}.
+            
+            Content to Review: {content}...
+            
+            Evaluate:
+            - Technical accuracy
+            - Brand alignment
+            - Audience fit
+            - Content quality
+            - Compliance
+            
+            Provide assessment and recommendations in JSON format.
+            """
+
+@st.cache_resource
+def _product_research_prompt(product_key: str) -> str:
+    """The product research prompt depends only on the product, so it is formatted once per process.
+    
+    A module-level table would be rebuilt on every rerun along with the rest of the script.
+    """
+    product = PRODUCTS[product_key]
+    return PRODUCT_RESEARCH_PROMPT.format(product_name=product['name'],
+                                          product_description=product['description'])
+
 class StreamlitBedrockAgent:
     """Streamlit-optimized Bedrock Agent wrapper with enhanced visibility."""
     
-    def __init__(self, agent_id: str, agent_name: str):
+    def __init__(self, agent_id: str, agent_name: str, clients: dict = None):
         self.agent_id = agent_id
         self.agent_name = agent_name
-        self.clients = get_aws_clients()
+        self.display_name = AGENT_DISPLAY_NAMES.get(agent_name, agent_name)
+        self.clients = clients or get_aws_clients()
         
-    def invoke(self, prompt: str, session_id: str = None) -> dict:
-        """Invoke the agent with a prompt and return detailed response."""
+    def invoke(self, prompt: str, session_id: str = None, stream: bool = False) -> dict:
+        """Invoke the agent with a prompt and return detailed response.
+        
+        With stream=True the response text is written to the page as it arrives.
+        """
         if not session_id:
-            session_id = str(uuid.uuid4())
+            session_id = uuid.uuid4().hex
+        
+        status_container = self._show_invocation_start(prompt, session_id)
+        outcome = self._cached_outcome(prompt)
+        if outcome is None:
+            try:
+                if stream:
+                    outcome = self._stream_agent(status_container, prompt, session_id)
+                else:
+                    outcome = self._call_agent(prompt, session_id)
+            except Exception as e:
+                outcome = e
+            self._remember(prompt, outcome)
+        return self._show_invocation_result(status_container, session_id, outcome)
+    
+    def invoke_stream(self, prompt: str, session_id: str):
+        """Yield the agent's response text chunk by chunk as it arrives."""
+        # chunk boundaries can fall inside a multi-byte character
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        for data in self._stream_bytes(prompt, session_id):
+            text = decoder.decode(data)
+            if text:
+                yield text
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+    
+    def _stream_bytes(self, prompt: str, session_id: str):
+        """Yield the raw bytes of each response chunk from invoke_agent."""
+        response = self.clients['bedrock_agent_runtime'].invoke_agent(
+            agentId=self.agent_id,
+            agentAliasId='TSTALIASID',
+            sessionId=session_id,
+            inputText=prompt
+        )
+        
+        for event in response['completion']:
+            chunk = event.get('chunk')
+            if chunk and 'bytes' in chunk:
+                yield chunk['bytes']
+    
+    def _cache_key(self, prompt: str) -> tuple:
+        return self.agent_name, hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    
+    def _cached_outcome(self, prompt: str):
+        """Return a still-fresh _call_agent result for this prompt, or None."""
+        cache, lock = _response_cache()
+        key = self._cache_key(prompt)
+        with lock:
+            entry = cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= perf_counter():
+                del cache[key]
+                return None
+            cache.move_to_end(key)
+            return entry[1]
+    
+    def _remember(self, prompt: str, outcome) -> None:
+        """Cache a successful, non-empty _call_agent result; errors are always retried."""
+        if not isinstance(outcome, Exception) and outcome[0]:
+            cache, lock = _response_cache()
+            key = self._cache_key(prompt)
+            with lock:
+                cache[key] = (perf_counter() + RESPONSE_CACHE_TTL, outcome)
+                cache.move_to_end(key)
+                if len(cache) > RESPONSE_CACHE_SIZE:
+                    cache.popitem(last=False)
+    
+    def _show_invocation_start(self, prompt: str, session_id: str):
+        """Log the invocation and render its in-progress status; returns the placeholder holding it.
+        
+        The placeholder is rewritten in place as the call streams and completes.
+        """
+        started = datetime.datetime.now().isoformat()
         
         # Log invocation start
         log_agent_activity(
@@ -121,88 +364,71 @@ class StreamlitBedrockAgent:
             {
                 'prompt_length': len(prompt),
                 'session_id': session_id
-            }
+            },
+            timestamp=started
         )
         
-        try:
-            # Create a status container for real-time updates
-            status_container = st.container()
-            with status_container:
-                st.info(f"🤖 **{self.agent_name.replace('_', ' ').title()}** (ID: `{self.agent_id}`) is processing your request...")
-                
-                # Show the actual API call being made
-                with st.expander("📡 Real-time Agent API Call", expanded=True):
-                    st.code(f"""
-# LIVE BEDROCK AGENT INVOCATION
-Agent ID: {self.agent_id}
-Agent Alias: TSTALIASID
-Session ID: {session_id}
-Timestamp: {datetime.datetime.now().isoformat()}
-                    """, language="yaml")
-            
-            start_time = time.time()
-            
-            # Make the actual Bedrock agent call
-            response = self.clients['bedrock_agent_runtime'].invoke_agent(
-                agentId=self.agent_id,
-                agentAliasId='TSTALIASID',
-                sessionId=session_id,
-                inputText=prompt
-            )
-            
-            # Extract response from event stream
-            result = ""
+        # Create a status placeholder for real-time updates
+        status_container = st.empty()
+        with status_container.container():
+            st.info(self._processing_message())
+            
+            # Show the actual API call being made
+            with st.expander("📡 Real-time Agent API Call", expanded=True):
+                st.text(
+                    "# LIVE BEDROCK AGENT INVOCATION\n"
+                    f"Agent ID: {self.agent_id}\n"
+                    "Agent Alias: TSTALIASID\n"
+                    f"Session ID: {session_id}\n"
+                    f"Timestamp: {started}"
+                )
+        return status_container
+    
+    def _processing_message(self) -> str:
+        return f"🤖 **{self.display_name}** (ID: `{self.agent_id}`) is processing your request..."
+    
+    def _call_agent(self, prompt: str, session_id: str) -> tuple:
+        """Make the Bedrock agent call and drain its stream; returns (result, event_count, duration).
+        
+        Makes no Streamlit calls, so it is safe to run on a worker thread.
+        """
+        start_time = perf_counter()
+        for attempt in range(AGENT_CALL_ATTEMPTS):
+            buffer = bytearray()
             event_count = 0
-            
-            for event in response['completion']:
-                if 'chunk' in event:
-                    chunk = event['chunk']
-                    if 'bytes' in chunk:
-                        result += chunk['bytes'].decode('utf-8')
-                        event_count += 1
-            
-            end_time = time.time()
-            duration = end_time - start_time
-            
-            # Update status with success
-            status_container.empty()
-            with status_container:
-                st.success(f"✅ **{self.agent_name.replace('_', ' ').title()}** completed successfully!")
-                
-                with st.expander("📊 Agent Response Details", expanded=False):
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Response Time", f"{duration:.2f}s")
-                    with col2:
-                        st.metric("Events Processed", event_count)
-                    with col3:
-                        st.metric("Response Length", len(result))
-            
-            # Log successful completion
-            log_agent_activity(
-                self.agent_name, 
-                self.agent_id, 
-                "INVOCATION_SUCCESS",
-                {
-                    'duration_seconds': duration,
-                    'response_length': len(result),
-                    'events_processed': event_count
-                }
-            )
-            
-            return {
-                'content': result,
-                'metadata': {
-                    'agent_id': self.agent_id,
-                    'agent_name': self.agent_name,
-                    'session_id': session_id,
-                    'duration': duration,
-                    'timestamp': datetime.datetime.now().isoformat(),
-                    'events_processed': event_count
-                }
-            }
-                
-        except Exception as e:
+            try:
+                for data in self._stream_bytes(prompt, session_id):
+                    buffer += data
+                    event_count += 1
+                return buffer.decode('utf-8'), event_count, perf_counter() - start_time
+            except ClientError as e:
+                # botocore retries the request itself, but not a stream that fails part way
+                code = e.response.get('Error', {}).get('Code', '')
+                if attempt == AGENT_CALL_ATTEMPTS - 1 or code.lower() not in RETRYABLE_STREAM_ERRORS:
+                    raise
+                logger.warning(f"Retrying {self.agent_name} after {code}")
+                sleep(2 ** attempt + random.random())
+    
+    def _stream_agent(self, status_container, prompt: str, session_id: str) -> tuple:
+        """Like _call_agent, but writes the text into the status placeholder while it streams."""
+        start_time = perf_counter()
+        chunks = []
+        
+        def collect():
+            for text in self.invoke_stream(prompt, session_id):
+                chunks.append(text)
+                yield text
+        
+        with status_container.container():
+            st.info(self._processing_message())
+            st.write_stream(collect())
+        return "".join(chunks), len(chunks), perf_counter() - start_time
+    
+    def _show_invocation_result(self, status_container, session_id: str, outcome) -> dict:
+        """Render and log the outcome of _call_agent (its result tuple or the exception raised)."""
+        finished = datetime.datetime.now().isoformat()
+        if isinstance(outcome, Exception):
+            e = outcome
             # Log error
             log_agent_activity(
                 self.agent_name, 
@@ -211,10 +437,12 @@ Timestamp: {datetime.datetime.now().isoformat()}
                 {
                     'error': str(e),
                     'error_type': type(e).__name__
-                }
+                },
+                timestamp=finished
             )
             
             logger.error(f"Error invoking agent {self.agent_name}: {str(e)}")
+            status_container.error(f"❌ **{self.display_name}** failed: {str(e)}")
             return {
                 'content': f"Error: {str(e)}",
                 'metadata': {
@@ -222,20 +450,64 @@ Timestamp: {datetime.datetime.now().isoformat()}
                     'agent_name': self.agent_name,
                     'session_id': session_id,
                     'error': str(e),
-                    'timestamp': datetime.datetime.now().isoformat()
+                    'timestamp': finished
                 }
             }
+        
+        result, event_count, duration = outcome
+        
+        # Replace the in-progress view with the success summary
+        with status_container.container():
+            st.success(f"✅ **{self.display_name}** completed successfully!")
+            
+            with st.expander("📊 Agent Response Details", expanded=False):
+                st.markdown(
+                    "| Response Time | Events Processed | Response Length |\n"
+                    "|---|---|---|\n"
+                    f"| {duration:.2f}s | {event_count} | {len(result)} |"
+                )
+        
+        # Log successful completion
+        log_agent_activity(
+            self.agent_name, 
+            self.agent_id, 
+            "INVOCATION_SUCCESS",
+            {
+                'duration_seconds': duration,
+                'response_length': len(result),
+                'events_processed': event_count
+            },
+            timestamp=finished
+        )
+        
+        return {
+            'content': result,
+            'metadata': {
+                'agent_id': self.agent_id,
+                'agent_name': self.agent_name,
+                'session_id': session_id,
+                'duration': duration,
+                'timestamp': finished,
+                'events_processed': event_count
+            }
+        }
 
 class StreamlitMarketingCampaignGenerator:
     """Streamlit marketing campaign generator using real Bedrock agents with enhanced visibility."""
     
     def __init__(self):
         self.agents = {}
-        self.session_id = st.session_state['current_session_id']
         self.clients = get_aws_clients()
+    
+    @property
+    def session_id(self) -> str:
+        # read on use, so a generator kept across "New Session" follows the current session
+        return st.session_state['current_session_id']
         
     def discover_agents(self) -> bool:
         """Discover existing TeraSky marketing agents."""
+        # a fresh dict, so agents handed out by an earlier discovery are left untouched
+        self.agents = {}
         try:
             # Create a real-time discovery status
             discovery_container = st.container()
@@ -243,32 +515,26 @@ class StreamlitMarketingCampaignGenerator:
                 st.info("🔍 Discovering TeraSky Bedrock Agents...")
                 
                 with st.expander("📡 Live Agent Discovery API Call", expanded=True):
-                    st.code(f"""
-# LIVE BEDROCK AGENT DISCOVERY
-API Endpoint: bedrock-agent.list_agents()
-Timestamp: {datetime.datetime.now().isoformat()}
-Session: {self.session_id}
-                    """, language="yaml")
-            
-            response = self.clients['bedrock_agent'].list_agents()
-            agents = response.get('agentSummaries', [])
-            
-            # Find TeraSky marketing agents
-            agent_names = ['product_researcher', 'audience_researcher', 'campaign_strategist', 'content_creator', 'qa_validator']
+                    st.text(
+                        "# LIVE BEDROCK AGENT DISCOVERY\n"
+                        "API Endpoint: bedrock-agent.list_agents()\n"
+                        f"Timestamp: {datetime.datetime.now().isoformat()}\n"
+                        f"Session: {self.session_id}"
+                    )
+            
             discovered_agents = []
             
-            for agent in agents:
-                agent_name = agent['agentName']
-                if agent_name in agent_names and agent['agentStatus'] in ['PREPARED', 'CREATED']:
-                    self.agents[agent_name] = StreamlitBedrockAgent(
-                        agent_id=agent['agentId'],
-                        agent_name=agent_name
-                    )
-                    discovered_agents.append({
-                        'name': agent_name,
-                        'id': agent['agentId'],
-                        'status': agent['agentStatus']
-                    })
+            for agent_name, agent in _list_terasky_agents(*get_aws_info()).items():
+                self.agents[agent_name] = StreamlitBedrockAgent(
+                    agent_id=agent['id'],
+                    agent_name=agent_name,
+                    clients=self.clients
+                )
+                discovered_agents.append({
+                    'name': agent_name,
+                    'id': agent['id'],
+                    'status': agent['status']
+                })
             
             # Update discovery status
             discovery_container.empty()
@@ -278,7 +544,7 @@ Session: {self.session_id}
                     
                     with st.expander("🤖 Discovered Agent Details", expanded=True):
                         for agent_info in discovered_agents:
-                            st.write(f"**{agent_info['name'].replace('_', ' ').title()}**")
+                            st.write(f"**{AGENT_DISPLAY_NAMES.get(agent_info['name'], agent_info['name'])}**")
                             st.write(f"- Agent ID: `{agent_info['id']}`")
                             st.write(f"- Status: `{agent_info['status']}`")
                             st.write("---")
@@ -291,7 +557,6 @@ Session: {self.session_id}
                 "DISCOVERY",
                 "AGENT_DISCOVERY",
                 {
-                    'total_agents_found': len(agents),
                     'terasky_agents_found': len(self.agents),
                     'discovered_agents': discovered_agents
                 }
@@ -311,7 +576,7 @@ Session: {self.session_id}
         if not product_info:
             raise Exception(f"Product {product_key} not found")
         
-        campaign_id = f"terasky-campaign-{str(uuid.uuid4())}"
+        campaign_id = f"terasky-campaign-{uuid.uuid4().hex}"
         results = {
             'campaign_id': campaign_id,
             'product': product_info,
@@ -320,6 +585,7 @@ Session: {self.session_id}
             'results': {},
             'agent_metadata': {}
         }
+        start_time = perf_counter()
         
         # Create campaign tracking section
         st.subheader("🚀 Live Campaign Generation")
@@ -330,38 +596,30 @@ Session: {self.session_id}
             st.info(f"**Campaign ID**: `{campaign_id}`")
             
             # Progress tracking
+            # One element carries both the bar and the step label, so each step
+            # is a single update to the page
             progress_bar = st.progress(0)
-            status_text = st.empty()
             
             # Real-time agent workflow display
             workflow_container = st.container()
             
+        prompt_inputs = {
+            'product_name': product_info['name'],
+            'product_description': product_info['description']
+        }
+        
+        # Each step builds on the output of the one before it, so they run in order
+        
         # Step 1: Product Research
         if 'product_researcher' in self.agents:
             with workflow_container:
                 st.markdown("### 🔍 Step 1/5: Product Research Agent")
                 
-            status_text.text("🔍 Step 1/5: Conducting Product Research...")
-            progress_bar.progress(0.2)
-            
-            product_prompt = f"""
-            Conduct comprehensive research on TeraSky's {product_info['name']} solution.
-            
-            Product: {product_info['name']}
-            Description: {product_info['description']}
-            
-            Analyze:
-            - Key features and capabilities
-            - Competitive advantages
-            - Target market
-            - Value propositions
-            - Technical specifications
-            - Market positioning
+            progress_bar.progress(0.2, text="🔍 Step 1/5: Conducting Product Research...")
             
-            Provide a detailed analysis in JSON format.
-            """
+            product_prompt = _product_research_prompt(product_key)
             
-            agent_response = self.agents['product_researcher'].invoke(product_prompt, self.session_id)
+            agent_response = self.agents['product_researcher'].invoke(product_prompt, self.session_id, stream=True)
             results['results']['product_research'] = agent_response['content']
             results['agent_metadata']['product_researcher'] = agent_response['metadata']
         
@@ -370,26 +628,13 @@ Session: {self.session_id}
             with workflow_container:
                 st.markdown("### 👥 Step 2/5: Audience Research Agent")
                 
-            status_text.text("👥 Step 2/5: Analyzing Target Audience...")
-            progress_bar.progress(0.4)
-            
-            audience_prompt = f"""
-            Based on the product research for {product_info['name']}, analyze the target audience.
-            
-            Product Research Results: {results['results'].get('product_research', '')[:1000]}...
-            
-            Identify:
-            - Target personas and roles
-            - Company profiles
-            - Pain points and challenges
-            - Decision-making processes
-            - Communication preferences
-            - Budget considerations
+            progress_bar.progress(0.4, text="👥 Step 2/5: Analyzing Target Audience...")
             
-            Provide analysis in JSON format.
-            """
+            audience_prompt = AUDIENCE_RESEARCH_PROMPT.format(
+                **prompt_inputs, product_research=results['results'].get('product_research', '')[:1000]
+            )
             
-            agent_response = self.agents['audience_researcher'].invoke(audience_prompt, self.session_id)
+            agent_response = self.agents['audience_researcher'].invoke(audience_prompt, self.session_id, stream=True)
             results['results']['audience_research'] = agent_response['content']
             results['agent_metadata']['audience_researcher'] = agent_response['metadata']
         
@@ -398,27 +643,15 @@ Session: {self.session_id}
             with workflow_container:
                 st.markdown("### 📋 Step 3/5: Campaign Strategist Agent")
                 
-            status_text.text("📋 Step 3/5: Developing Campaign Strategy...")
-            progress_bar.progress(0.6)
-            
-            strategy_prompt = f"""
-            Develop a comprehensive marketing strategy for {product_info['name']}.
-            
-            Product Research: {results['results'].get('product_research', '')[:500]}...
-            Audience Research: {results['results'].get('audience_research', '')[:500]}...
-            
-            Create:
-            - Campaign objectives and metrics
-            - Channel strategy
-            - Content strategy
-            - Targeting approach
-            - Timeline and phases
-            - Budget recommendations
+            progress_bar.progress(0.6, text="📋 Step 3/5: Developing Campaign Strategy...")
             
-            Provide strategy in JSON format.
-            """
+            strategy_prompt = CAMPAIGN_STRATEGY_PROMPT.format(
+                **prompt_inputs,
+                product_research=results['results'].get('product_research', '')[:500],
+                audience_research=results['results'].get('audience_research', '')[:500]
+            )
             
-            agent_response = self.agents['campaign_strategist'].invoke(strategy_prompt, self.session_id)
+            agent_response = self.agents['campaign_strategist'].invoke(strategy_prompt, self.session_id, stream=True)
             results['results']['campaign_strategy'] = agent_response['content']
             results['agent_metadata']['campaign_strategist'] = agent_response['metadata']
         
@@ -427,25 +660,13 @@ Session: {self.session_id}
             with workflow_container:
                 st.markdown("### ✍️ Step 4/5: Content Creator Agent")
                 
-            status_text.text("✍️ Step 4/5: Creating Marketing Content...")
-            progress_bar.progress(0.8)
-            
-            content_prompt = f"""
-            Create compelling marketing content for {product_info['name']}.
-            
-            Strategy: {results['results'].get('campaign_strategy', '')[:500]}...
-            
-            Create content for:
-            - Social media (LinkedIn, Twitter, Facebook)
-            - Email marketing
-            - Blog articles
-            - Ad copy
-            - Landing pages
+            progress_bar.progress(0.8, text="✍️ Step 4/5: Creating Marketing Content...")
             
-            Maintain TeraSky's professional brand voice. Provide in JSON format.
-            """
+            content_prompt = CONTENT_CREATION_PROMPT.format(
+                **prompt_inputs, campaign_strategy=results['results'].get('campaign_strategy', '')[:500]
+            )
             
-            agent_response = self.agents['content_creator'].invoke(content_prompt, self.session_id)
+            agent_response = self.agents['content_creator'].invoke(content_prompt, self.session_id, stream=True)
             results['results']['content'] = agent_response['content']
             results['agent_metadata']['content_creator'] = agent_response['metadata']
         
@@ -454,29 +675,21 @@ Session: {self.session_id}
             with workflow_container:
                 st.markdown("### ✅ Step 5/5: QA Validator Agent")
                 
-            status_text.text("✅ Step 5/5: Quality Assurance Review...")
-            progress_bar.progress(1.0)
-            
-            qa_prompt = f"""
-            Review and validate the marketing campaign for {product_info['name']}.
-            
-            Content to Review: {results['results'].get('content', '')[:500]}...
-            
-            Evaluate:
-            - Technical accuracy
-            - Brand alignment
-            - Audience fit
-            - Content quality
-            - Compliance
+            progress_bar.progress(1.0, text="✅ Step 5/5: Quality Assurance Review...")
             
-            Provide assessment and recommendations in JSON format.
-            """
+            qa_prompt = QA_REVIEW_PROMPT.format(**prompt_inputs, content=results['results'].get('content', '')[:500])
             
-            agent_response = self.agents['qa_validator'].invoke(qa_prompt, self.session_id)
+            agent_response = self.agents['qa_validator'].invoke(qa_prompt, self.session_id, stream=True)
             results['results']['qa_results'] = agent_response['content']
             results['agent_metadata']['qa_validator'] = agent_response['metadata']
         
-        status_text.text("🎉 Campaign generation completed!")
+        progress_bar.progress(1.0, text="🎉 Campaign generation completed!")
+        
+        # Wall time beyond the summed agent time is page and session overhead
+        results['timings'] = {
+            'agent_total': sum(meta.get('duration', 0) for meta in results['agent_metadata'].values()),
+            'wall': perf_counter() - start_time
+        }
         
         # Log campaign completion
         log_agent_activity(
@@ -486,25 +699,13 @@ Session: {self.session_id}
             {
                 'campaign_id': campaign_id,
                 'agents_used': len(results['agent_metadata']),
-                'total_duration': sum(meta.get('duration', 0) for meta in results['agent_metadata'].values())
+                'total_duration': results['timings']['agent_total']
             }
         )
         
         return results
 
-def main():
-    """Main Streamlit application."""
-    
-    # Page configuration
-    st.set_page_config(
-        page_title="TeraSky Marketing Campaign Generator",
-        page_icon="🚀",
-        layout="wide",
-        initial_sidebar_state="expanded"
-    )
-    
-    # Custom CSS
-    st.markdown("""
+CUSTOM_CSS = """
     <style>
     .main-header {
         background: linear-gradient(90deg, #1e3c72 0%, #2a5298 100%);
@@ -556,7 +757,107 @@ def main():
         margin: 0.25rem 0;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+# st.fragment is newer than the pinned Streamlit; without it the panel renders with the page
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+def _clear_activity_log():
+    st.session_state['agent_activity_log'] = deque(maxlen=ACTIVITY_LOG_SIZE)
+    st.session_state['agent_invocation_count'] = 0
+
+@_fragment
+def render_activity_log():
+    """Sidebar activity panel; as a fragment, clearing it reruns only this panel."""
+    # Agent Activity Dashboard
+    st.subheader("📊 Live Agent Activity")
+    st.metric("Agent Invocations", st.session_state['agent_invocation_count'])
+    if st.session_state['agent_activity_log']:
+        # Show recent activity (last 5 entries), most recent first
+        for activity in islice(reversed(st.session_state['agent_activity_log']), 5):
+            timestamp = datetime.datetime.fromisoformat(activity['timestamp']).strftime("%H:%M:%S")
+            
+            if activity['action'] == 'INVOCATION_START':
+                st.markdown(f"""
+                <div class="agent-invocation">
+                    <strong>{timestamp}</strong><br>
+                    🚀 {AGENT_DISPLAY_NAMES.get(activity['agent_name'], activity['agent_name'])}<br>
+                    <small>Started processing...</small>
+                </div>
+                """, unsafe_allow_html=True)
+            elif activity['action'] == 'INVOCATION_SUCCESS':
+                duration = activity['details'].get('duration_seconds', 0)
+                st.markdown(f"""
+                <div class="agent-success">
+                    <strong>{timestamp}</strong><br>
+                    ✅ {AGENT_DISPLAY_NAMES.get(activity['agent_name'], activity['agent_name'])}<br>
+                    <small>Completed in {duration:.1f}s</small>
+                </div>
+                """, unsafe_allow_html=True)
+            elif activity['action'] == 'INVOCATION_ERROR':
+                st.markdown(f"""
+                <div class="agent-error">
+                    <strong>{timestamp}</strong><br>
+                    ❌ {AGENT_DISPLAY_NAMES.get(activity['agent_name'], activity['agent_name'])}<br>
+                    <small>Error occurred</small>
+                </div>
+                """, unsafe_allow_html=True)
+        
+        # cleared in a callback so the emptied log is what this run renders
+        st.button("🗑️ Clear Activity Log", type="secondary", on_click=_clear_activity_log)
+    else:
+        st.info("No agent activity yet. Start generating a campaign!")
+
+# Result views: radio label -> (results key, heading); None is the overview
+RESULT_VIEWS = {
+    "📊 Overview": None,
+    "🔍 Product Research": ('product_research', "🔍 Product Research"),
+    "👥 Audience Analysis": ('audience_research', "👥 Audience Analysis"),
+    "📋 Strategy": ('campaign_strategy', "📋 Campaign Strategy"),
+    "✍️ Content": ('content', "✍️ Marketing Content"),
+    "✅ QA Review": ('qa_results', "✅ Quality Assurance"),
+}
+
+@_fragment
+def render_campaign_results(results: dict):
+    """Render only the selected result view; st.tabs would send every tab's content each run."""
+    selected = st.radio("View", list(RESULT_VIEWS), horizontal=True, key='results_view',
+                        label_visibility="collapsed")
+    view = RESULT_VIEWS[selected]
+    
+    if view is None:
+        st.subheader("Campaign Overview")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Campaign ID", results['campaign_id'][-8:])
+        with col2:
+            st.metric("Product", results['product']['name'])
+        with col3:
+            st.metric("Steps Completed", len(results['results']))
+        return
+    
+    key, title = view
+    if not results['results'].get(key):
+        st.info("Not generated")
+        return
+    st.subheader(title)
+    # st.code is a one-way render, unlike text_area, so the result is not
+    # round-tripped as widget state on every rerun
+    st.code(results['results'][key], language='json')
+
+def main():
+    """Main Streamlit application."""
+    
+    # Page configuration
+    st.set_page_config(
+        page_title="TeraSky Marketing Campaign Generator",
+        page_icon="🚀",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    # Custom CSS; Streamlit rebuilds the page on every rerun, so it is emitted each time
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
     
     # Header
     st.markdown("""
@@ -577,21 +878,21 @@ def main():
         # Session Info
         st.subheader("🔄 Current Session")
         st.info(f"**Session ID:** `{st.session_state['current_session_id'][:8]}...`")
-        st.metric("Agent Invocations", st.session_state['agent_invocation_count'])
         
         # Product selection
         st.subheader("📦 Select Product")
         product_key = st.selectbox(
             "Choose a TeraSky product:",
-            options=list(PRODUCTS.keys()),
-            format_func=lambda x: f"{PRODUCTS[x]['icon']} {PRODUCTS[x]['name']}"
+            options=list(PRODUCT_LABELS),
+            format_func=PRODUCT_LABELS.__getitem__
         )
         
         # Agent discovery
         st.subheader("🤖 Bedrock Agents")
         if st.button("🔍 Discover Agents", type="primary"):
             with st.spinner("Discovering Bedrock agents..."):
-                campaign_generator = StreamlitMarketingCampaignGenerator()
+                # one generator per session, reused by later discoveries
+                campaign_generator = st.session_state.get('campaign_generator') or StreamlitMarketingCampaignGenerator()
                 if campaign_generator.discover_agents():
                     st.session_state['agents'] = campaign_generator.agents
                     st.session_state['campaign_generator'] = campaign_generator
@@ -599,52 +900,12 @@ def main():
                 else:
                     st.error("No TeraSky marketing agents found. Please create them first.")
         
-        # Agent Activity Dashboard
-        st.subheader("📊 Live Agent Activity")
-        if st.session_state['agent_activity_log']:
-            # Show recent activity (last 5 entries)
-            recent_activities = st.session_state['agent_activity_log'][-5:]
-            
-            for activity in reversed(recent_activities):  # Show most recent first
-                timestamp = datetime.datetime.fromisoformat(activity['timestamp']).strftime("%H:%M:%S")
-                
-                if activity['action'] == 'INVOCATION_START':
-                    st.markdown(f"""
-                    <div class="agent-invocation">
-                        <strong>{timestamp}</strong><br>
-                        🚀 {activity['agent_name'].replace('_', ' ').title()}<br>
-                        <small>Started processing...</small>
-                    </div>
-                    """, unsafe_allow_html=True)
-                elif activity['action'] == 'INVOCATION_SUCCESS':
-                    duration = activity['details'].get('duration_seconds', 0)
-                    st.markdown(f"""
-                    <div class="agent-success">
-                        <strong>{timestamp}</strong><br>
-                        ✅ {activity['agent_name'].replace('_', ' ').title()}<br>
-                        <small>Completed in {duration:.1f}s</small>
-                    </div>
-                    """, unsafe_allow_html=True)
-                elif activity['action'] == 'INVOCATION_ERROR':
-                    st.markdown(f"""
-                    <div class="agent-error">
-                        <strong>{timestamp}</strong><br>
-                        ❌ {activity['agent_name'].replace('_', ' ').title()}<br>
-                        <small>Error occurred</small>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            if st.button("🗑️ Clear Activity Log", type="secondary"):
-                st.session_state['agent_activity_log'] = []
-                st.session_state['agent_invocation_count'] = 0
-                st.rerun()
-        else:
-            st.info("No agent activity yet. Start generating a campaign!")
+        render_activity_log()
         
         # New session button
         if st.button("🔄 New Session", type="secondary"):
-            st.session_state['current_session_id'] = str(uuid.uuid4())
-            st.session_state['agent_activity_log'] = []
+            st.session_state['current_session_id'] = uuid.uuid4().hex
+            st.session_state['agent_activity_log'] = deque(maxlen=ACTIVITY_LOG_SIZE)
             st.session_state['agent_invocation_count'] = 0
             st.rerun()
     
@@ -652,7 +913,7 @@ def main():
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        st.header(f"{PRODUCTS[product_key]['icon']} {PRODUCTS[product_key]['name']}")
+        st.header(PRODUCT_LABELS[product_key])
         st.write(PRODUCTS[product_key]['description'])
         
         # Show discovered agents
@@ -661,7 +922,7 @@ def main():
             for agent_name, agent in st.session_state['agents'].items():
                 st.markdown(f"""
                 <div class="agent-card">
-                    <strong>{agent_name.replace('_', ' ').title()}</strong><br>
+                    <strong>{agent.display_name}</strong><br>
                     <small>Agent ID: {agent.agent_id}</small>
                 </div>
                 """, unsafe_allow_html=True)
@@ -670,15 +931,23 @@ def main():
         if st.button("🚀 Generate Marketing Campaign", type="primary", disabled='agents' not in st.session_state):
             if 'campaign_generator' in st.session_state:
                 try:
-                    start_time = time.time()
+                    start_time = perf_counter()
                     
                     # Generate campaign
                     results = st.session_state['campaign_generator'].generate_campaign(product_key)
                     
-                    # Store results
+                    # Store results, with the overview serialized once for the status panel
                     st.session_state['campaign_results'] = results
+                    st.session_state['latency_stats'].append(results['timings'])
+                    st.session_state['campaign_overview_json'] = json.dumps({
+                        'Campaign ID': results['campaign_id'],
+                        'Product': results['product']['name'],
+                        'Session ID': results.get('session_id', 'N/A'),
+                        'Generated': results['timestamp'],
+                        'Steps Completed': len(results['results'])
+                    }, indent=2, default=str)
                     
-                    duration = time.time() - start_time
+                    duration = perf_counter() - start_time
                     st.success(f"✅ Campaign generated successfully in {duration:.1f} seconds!")
                     
                 except Exception as e:
@@ -691,27 +960,30 @@ def main():
             results = st.session_state['campaign_results']
             
             # Campaign overview metrics
-            col2_1, col2_2 = st.columns(2)
+            timings = results['timings']
+            col2_1, col2_2, col2_3 = st.columns(3)
             with col2_1:
                 st.metric("Agents Used", len(results.get('agent_metadata', {})))
             with col2_2:
-                total_duration = sum(meta.get('duration', 0) for meta in results.get('agent_metadata', {}).values())
-                st.metric("Total Time", f"{total_duration:.1f}s")
+                st.metric("Agent Time", f"{timings['agent_total']:.1f}s")
+            with col2_3:
+                st.metric("Wall Time", f"{timings['wall']:.1f}s")
+            
+            # Recent runs: agent time against the overhead around it
+            if len(st.session_state['latency_stats']) > 1:
+                st.bar_chart({
+                    'Agent time (s)': [run['agent_total'] for run in st.session_state['latency_stats']],
+                    'Wall time (s)': [run['wall'] for run in st.session_state['latency_stats']]
+                })
             
             # Campaign details
-            st.json({
-                'Campaign ID': results['campaign_id'],
-                'Product': results['product']['name'],
-                'Session ID': results.get('session_id', 'N/A'),
-                'Generated': results['timestamp'],
-                'Steps Completed': len(results['results'])
-            })
+            st.code(st.session_state['campaign_overview_json'], language='json')
             
             # Agent execution summary
             if 'agent_metadata' in results:
                 st.subheader("🤖 Agent Execution Details")
                 for agent_name, metadata in results['agent_metadata'].items():
-                    with st.expander(f"📋 {agent_name.replace('_', ' ').title()}", expanded=False):
+                    with st.expander(f"📋 {AGENT_DISPLAY_NAMES.get(agent_name, agent_name)}", expanded=False):
                         col_a, col_b, col_c = st.columns(3)
                         with col_a:
                             st.metric("Duration", f"{metadata.get('duration', 0):.2f}s")
@@ -728,42 +1000,7 @@ def main():
         st.header("📋 Campaign Results")
         results = st.session_state['campaign_results']
         
-        tabs = st.tabs(["📊 Overview", "🔍 Product Research", "👥 Audience Analysis", "📋 Strategy", "✍️ Content", "✅ QA Review"])
-        
-        with tabs[0]:
-            st.subheader("Campaign Overview")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Campaign ID", results['campaign_id'][-8:])
-            with col2:
-                st.metric("Product", results['product']['name'])
-            with col3:
-                st.metric("Steps Completed", len(results['results']))
-        
-        with tabs[1]:
-            if 'product_research' in results['results']:
-                st.subheader("🔍 Product Research")
-                st.text_area("Research Results", results['results']['product_research'], height=400)
-        
-        with tabs[2]:
-            if 'audience_research' in results['results']:
-                st.subheader("👥 Audience Analysis")
-                st.text_area("Audience Analysis", results['results']['audience_research'], height=400)
-        
-        with tabs[3]:
-            if 'campaign_strategy' in results['results']:
-                st.subheader("📋 Campaign Strategy")
-                st.text_area("Strategy Details", results['results']['campaign_strategy'], height=400)
-        
-        with tabs[4]:
-            if 'content' in results['results']:
-                st.subheader("✍️ Marketing Content")
-                st.text_area("Content", results['results']['content'], height=400)
-        
-        with tabs[5]:
-            if 'qa_results' in results['results']:
-                st.subheader("✅ Quality Assurance")
-                st.text_area("QA Review", results['results']['qa_results'], height=400)
+        render_campaign_results(results)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
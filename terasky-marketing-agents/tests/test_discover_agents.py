@@ -0,0 +1,63 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import streamlit_bedrock_agents as app
+except ImportError:  # streamlit / boto3 not installed
+    app = None
+
+
+def stub_clients(summaries):
+    """Clients whose bedrock-agent list_agents paginator yields the given summaries in one page."""
+    paginator = mock.Mock()
+    paginator.paginate.return_value = [{'agentSummaries': summaries}]
+    bedrock_agent = mock.Mock()
+    bedrock_agent.get_paginator.return_value = paginator
+    return {
+        'bedrock_agent': bedrock_agent,
+        'bedrock_agent_runtime': mock.Mock(),
+        'iam': mock.Mock(),
+        'sts': mock.Mock(),
+    }
+
+
+@unittest.skipIf(app is None, "streamlit app dependencies are not installed")
+class TestDiscoverAgents(unittest.TestCase):
+    def setUp(self):
+        app._list_terasky_agents.clear()
+
+    def discover(self, summaries):
+        clients = stub_clients(summaries)
+        with mock.patch.object(app, 'get_aws_clients', return_value=clients), \
+                mock.patch.object(app, 'get_aws_info', return_value=('123456789012', 'us-east-1')):
+            generator = app.StreamlitMarketingCampaignGenerator()
+            return generator, generator.discover_agents()
+
+    def test_registers_usable_terasky_agents(self):
+        generator, found = self.discover([
+            {'agentName': 'product_researcher', 'agentId': 'A1', 'agentStatus': 'PREPARED'},
+            {'agentName': 'qa_validator', 'agentId': 'A2', 'agentStatus': 'NOT_PREPARED'},
+            {'agentName': 'someone_else', 'agentId': 'A3', 'agentStatus': 'PREPARED'},
+        ])
+
+        self.assertTrue(found)
+        self.assertEqual(list(generator.agents), ['product_researcher'])
+        self.assertEqual(generator.agents['product_researcher'].agent_id, 'A1')
+        last = app.st.session_state['agent_activity_log'][-1]
+        self.assertEqual(last['action'], 'AGENT_DISCOVERY')
+        self.assertEqual(last['details']['terasky_agents_found'], 1)
+
+    def test_no_agents_found(self):
+        generator, found = self.discover([])
+
+        self.assertFalse(found)
+        self.assertEqual(generator.agents, {})
+        self.assertEqual(app.st.session_state['agent_activity_log'][-1]['action'], 'AGENT_DISCOVERY')
+
+
+if __name__ == '__main__':
+    unittest.main()